@@ -154,12 +154,8 @@ def cmd_reset(args) -> None:
 
     monitor = FileMonitorService()
 
-    # Clear tracked files
-    monitor._tracked_files = {}
-
-    # Remove state file
-    if monitor.state_file.exists():
-        monitor.state_file.unlink()
+    # Clear tracked files, lookup indexes and the state file
+    monitor.reset_state()
 
     print("✅ System state reset successfully")
 
@@ -14,6 +14,10 @@ class DatabaseSettings(BaseSettings):
     filemaker_database: str = Field(default="CrownMasterDatabase")
     filemaker_username: Optional[str] = None
     filemaker_password: Optional[str] = None
+    # Extra connections opened for concurrent queries
+    pool_size: int = Field(default=4)
+    # How long fetched part metadata is reused before querying again
+    metadata_cache_seconds: float = Field(default=60.0)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -39,6 +43,7 @@ class ProcessingSettings(BaseSettings):
     min_resolution: int = Field(default=2500)
 
     scan_interval_seconds: int = Field(default=30)
+    watch_input_dir: bool = Field(default=True)  # Use filesystem events when watchfiles is installed
     processing_timeout_seconds: int = Field(default=300)
 
     model_config = SettingsConfigDict(
@@ -66,6 +71,21 @@ class WebSettings(BaseSettings):
     )
 
 
+class ServerSettings(BaseSettings):
+    """ASGI server (uvicorn) configuration for the FastAPI services."""
+    loop: str = Field(default="uvloop")
+    http: str = Field(default="httptools")
+    access_log: bool = Field(default=False)
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_prefix="SERVER_",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",
+    )
+
+
 class NotificationSettings(BaseSettings):
     """Notification configuration."""
     teams_webhook_url: Optional[str] = None
@@ -91,6 +111,7 @@ class Settings(BaseSettings):
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     processing: ProcessingSettings = Field(default_factory=ProcessingSettings)
     web: WebSettings = Field(default_factory=WebSettings)
+    server: ServerSettings = Field(default_factory=ServerSettings)
     notifications: NotificationSettings = Field(default_factory=NotificationSettings)
 
     model_config = SettingsConfigDict(
@@ -2,8 +2,8 @@
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, validator
+from typing import Dict, List, Optional, Any, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, validator
 import hashlib
 
 
@@ -93,6 +93,21 @@ class ProcessedFile(BaseModel):
     backup_locations: List[Path] = Field(default_factory=list)
     part_number: Optional[str] = None
 
+    _location_str_cache: Optional[Tuple[Path, str]] = PrivateAttr(default=None)
+
+    @property
+    def current_location_str(self) -> str:
+        """String form of current_location, cached until the location changes."""
+        location = self.current_location
+        if location is None:
+            return ""
+
+        cached = self._location_str_cache
+        if cached is None or cached[0] is not location:
+            cached = (location, str(location))
+            self._location_str_cache = cached
+        return cached[1]
+
     def add_processing_step(self, step_name: str, details: Dict[str, Any]) -> None:
         """Add a processing step to history."""
         self.processing_history.append({
@@ -1,18 +1,38 @@
 # ===== src/services/file_monitor_service.py =====
 import json
 import logging
+import os
+import stat
+import time
+import uuid
+from collections import defaultdict, deque
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from ..config.settings import settings
 from ..models.file_models import FileMetadata, FileStatus, FileType, ProcessedFile
-from ..utils.crypto_utils import calculate_file_checksums, generate_file_id
+from ..utils.crypto_utils import (
+    calculate_file_checksums, calculate_file_checksums_batch, generate_file_id, get_hash_backend_info
+)
 from ..utils.error_handling import handle_processing_errors
-from ..utils.filesystem_utils import is_valid_image_file, detect_file_type, ensure_directory
+from ..utils.filesystem_utils import (
+    FileStabilityTracker, is_candidate_image_name, is_valid_image_file, detect_file_type,
+    ensure_directory, scan_image_candidates
+)
 
 logger = logging.getLogger(__name__)
 
+# In-place overwrites don't touch the directory mtime, and network shares may
+# not update it or deliver inotify events reliably, so walk the directory at
+# least this often
+FULL_SCAN_INTERVAL_SECONDS = 300
+
+# Review decisions reported to the workflow, keyed by the status they set
+DECISION_ACTIONS = {FileStatus.APPROVED: "approve", FileStatus.REJECTED: "reject"}
+MAX_PENDING_DECISIONS = 1024
+
 
 class FileMonitorService:
     """
@@ -33,7 +53,39 @@ class FileMonitorService:
 
         ensure_directory(self.metadata_dir)
         self._tracked_files: Dict[str, ProcessedFile] = {}
+        # checksum_sha256 -> file_id, so duplicate checks don't walk every file
+        self._checksum_index: Dict[str, str] = {}
+        # status -> {file_id: file}, kept up to date as statuses change
+        self._by_status: Dict[FileStatus, Dict[str, ProcessedFile]] = defaultdict(dict)
+        # Bumped whenever a file is tracked or changes status, for cheap change checks;
+        # starts from the clock so a restarted monitor doesn't repeat old versions
+        self.status_version = time.time_ns()
+        # Approvals/rejections not yet acknowledged by the workflow
+        self._pending_decisions: Deque[Dict[str, Any]] = deque(maxlen=MAX_PENDING_DECISIONS)
+        # path -> (inode, size, mtime_ns) of directory entries already handled
+        self._seen_entries: Dict[Path, Tuple[int, int, int]] = {}
+        self._stability = FileStabilityTracker()
+        # Input dir mtime after a scan that left no entry pending
+        self._settled_dir_mtime_ns: Optional[int] = None
+        self._last_full_scan = 0.0
+        # Paths reported by a filesystem watcher; None when not watching
+        self._changed_paths: Optional[Set[Path]] = None
         self._load_state()
+        self._log_hash_backend()
+
+    def _log_hash_backend(self) -> None:
+        """Log which SHA256 implementation checksums will use."""
+        backend = get_hash_backend_info()
+        if backend["sha256_backend"] == "_hashlib":
+            logger.info(
+                f"Checksums using OpenSSL SHA256 ({backend['openssl_version']}, "
+                f"CPU SHA extensions: {backend['cpu_sha_extensions']})"
+            )
+        else:
+            logger.warning(
+                f"Checksums using builtin SHA256 ({backend['sha256_backend']}); "
+                f"link Python against OpenSSL for hardware-accelerated hashing"
+            )
 
     def _load_state(self) -> None:
         """Load previously tracked files from state file."""
@@ -52,23 +104,55 @@ class FileMonitorService:
                             metadata = FileMetadata(**file_data)
                             processed_file = ProcessedFile(metadata=metadata)
 
-                        self._tracked_files[processed_file.metadata.file_id] = processed_file
+                        self._track_file(processed_file)
                     except Exception as e:
                         logger.warning(f"Skipping invalid file data: {e}")
                         continue
 
+                # Files already examined, so a restart doesn't re-hash them
+                for path_str, entry_key in state_data.get('seen_entries', {}).items():
+                    self._seen_entries[Path(path_str)] = tuple(entry_key)
+
+                # Decisions the workflow hadn't acknowledged before the restart
+                self._pending_decisions.extend(state_data.get('pending_decisions', []))
+
                 logger.info(f"Loaded {len(self._tracked_files)} tracked files from state")
             else:
                 logger.info("No previous state found, starting fresh")
         except Exception as e:
             logger.error(f"Error loading state file: {e}")
             self._tracked_files = {}
+            self._checksum_index = {}
+            self._by_status = defaultdict(dict)
+            self._seen_entries = {}
+            self._pending_decisions.clear()
+
+    def _track_file(self, processed_file: ProcessedFile) -> None:
+        """Add a file to the tracked set and its lookup indexes."""
+        metadata = processed_file.metadata
+        previous = self._tracked_files.get(metadata.file_id)
+        if previous is not None:
+            self._by_status[previous.metadata.status].pop(metadata.file_id, None)
+        self._tracked_files[metadata.file_id] = processed_file
+        self._checksum_index.setdefault(metadata.checksum_sha256, metadata.file_id)
+        self._by_status[metadata.status][metadata.file_id] = processed_file
+        self.status_version += 1
+
+    def _set_status(self, file_obj: ProcessedFile, new_status: FileStatus, reason: Optional[str] = None) -> None:
+        """Change a tracked file's status and move it to its new status bucket."""
+        file_id = file_obj.metadata.file_id
+        self._by_status[file_obj.metadata.status].pop(file_id, None)
+        file_obj.update_status(new_status, reason)
+        self._by_status[new_status][file_id] = file_obj
+        self.status_version += 1
 
     def _save_state(self) -> None:
         """Save current tracked files to state file."""
         try:
             state_data = {
                 'tracked_files': [file.dict() for file in self._tracked_files.values()],
+                'seen_entries': {str(path): list(key) for path, key in self._seen_entries.items()},
+                'pending_decisions': list(self._pending_decisions),
                 'last_saved': datetime.now().isoformat(),
                 'total_files': len(self._tracked_files)
             }
@@ -92,20 +176,61 @@ class FileMonitorService:
             logger.warning(f"Input directory does not exist: {self.input_dir}")
             return []
 
+        now = time.monotonic()
+        full_scan_due = now - self._last_full_scan >= FULL_SCAN_INTERVAL_SECONDS
+        dir_mtime_ns = None
+
+        if self._changed_paths is not None and not full_scan_due:
+            # Watcher active: only look at paths it reported
+            entries = self._drain_changed_paths()
+        else:
+            # Nothing was added, removed or renamed since a recent scan that
+            # settled every entry, so there is nothing new to find
+            dir_mtime_ns = self._input_dir_mtime_ns()
+            if dir_mtime_ns == self._settled_dir_mtime_ns and not full_scan_due:
+                return []
+            self._last_full_scan = now
+            if self._changed_paths is not None:
+                self._changed_paths.clear()
+            entries = self._scan_input_dir()
+
         discovered_files = []
+        pending_paths = []
+        ready_entries = []
+        walked_paths = set()
+        seen_changed = False
+
+        for file_path, file_stat in entries:
+            walked_paths.add(file_path)
+            entry_key = (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+            if self._seen_entries.get(file_path) == entry_key:
+                continue
 
-        for file_path in self.input_dir.iterdir():
-            if not is_valid_image_file(file_path, settings.processing.min_file_size_bytes):
+            # Too small or still being written; look again next scan
+            if not is_valid_image_file(
+                    file_path, settings.processing.min_file_size_bytes, file_stat, self._stability
+            ):
+                pending_paths.append(file_path)
                 continue
 
+            ready_entries.append((file_path, file_stat, entry_key))
+
+        # Hash a scan's new files side by side rather than one after another
+        checksums = {}
+        if len(ready_entries) > 1:
+            checksums = calculate_file_checksums_batch([file_path for file_path, _, _ in ready_entries])
+
+        for file_path, file_stat, entry_key in ready_entries:
             try:
-                processed_file = self._create_file_metadata(file_path)
+                processed_file = self._create_file_metadata(file_path, file_stat, checksums.get(file_path))
+                self._seen_entries[file_path] = entry_key
+                seen_changed = True
 
                 # Check if we've already seen this file (by checksum)
                 existing_file = self.get_file_by_checksum(processed_file.metadata.checksum_sha256)
 
                 if not existing_file:
-                    self._tracked_files[processed_file.metadata.file_id] = processed_file
+                    self._track_file(processed_file)
                     discovered_files.append(processed_file)
                     logger.info(f"Discovered new file: {file_path.name} (ID: {processed_file.metadata.file_id})")
                 else:
@@ -113,20 +238,74 @@ class FileMonitorService:
 
             except Exception as e:
                 logger.error(f"Error processing file {file_path}: {e}")
+                pending_paths.append(file_path)
                 continue
 
-        if discovered_files:
+        if dir_mtime_ns is not None:
+            self._settled_dir_mtime_ns = None if pending_paths else dir_mtime_ns
+
+            # A full walk saw every file present; forget the ones that are gone
+            for gone_path in self._seen_entries.keys() - walked_paths:
+                del self._seen_entries[gone_path]
+                seen_changed = True
+            self._stability.retain(walked_paths)
+        if self._changed_paths is not None:
+            self._changed_paths.update(pending_paths)
+
+        if discovered_files or seen_changed:
             self._save_state()
 
         return discovered_files
 
-    def _create_file_metadata(self, file_path: Path) -> ProcessedFile:
+    def _input_dir_mtime_ns(self) -> int:
+        """Modification time of the input directory (changes on add/remove/rename)."""
+        return self.input_dir.stat().st_mtime_ns
+
+    def _scan_input_dir(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Yield candidate images in the input directory with their stat results."""
+        return scan_image_candidates(self.input_dir)
+
+    def _drain_changed_paths(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Yield candidate images reported by the watcher since the last scan."""
+        changed, self._changed_paths = self._changed_paths, set()
+        for file_path in changed:
+            if not is_candidate_image_name(file_path):
+                continue
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                continue  # Removed again before we got to it
+            if stat.S_ISREG(file_stat.st_mode):
+                yield file_path, file_stat
+
+    def start_watching(self) -> None:
+        """Switch discovery to paths reported through notify_changes()."""
+        if self._changed_paths is None:
+            self._changed_paths = set()
+            self._last_full_scan = 0.0  # Pick up existing files first
+
+    def stop_watching(self) -> None:
+        """Fall back to walking the input directory on every scan."""
+        self._changed_paths = None
+
+    def notify_changes(self, paths: Iterable[Path]) -> None:
+        """Record added/modified paths in the input directory."""
+        if self._changed_paths is not None:
+            self._changed_paths.update(paths)
+
+    def _create_file_metadata(
+            self,
+            file_path: Path,
+            file_stats: Optional[os.stat_result] = None,
+            checksums: Optional[Tuple[str, str]] = None
+    ) -> ProcessedFile:
         """Create file metadata for a discovered file."""
-        file_stats = file_path.stat()
+        if file_stats is None:
+            file_stats = file_path.stat()
         file_type = detect_file_type(file_path)
 
-        # Calculate checksums
-        md5_hash, sha256_hash = calculate_file_checksums(file_path)
+        # Calculate checksums unless already computed for the whole scan
+        md5_hash, sha256_hash = checksums or calculate_file_checksums(file_path)
         file_id = generate_file_id(file_path, sha256_hash)
 
         metadata = FileMetadata(
@@ -155,12 +334,9 @@ class FileMonitorService:
 
         return processed_file
 
-    def get_files_by_status(self, status: FileStatus) -> List[ProcessedFile]:
-        """Get all files with a specific status."""
-        return [
-            file for file in self._tracked_files.values()
-            if file.metadata.status == status
-        ]
+    def get_files_by_status(self, status: FileStatus, limit: Optional[int] = None) -> List[ProcessedFile]:
+        """Get files with a specific status, at most `limit` of them if given."""
+        return list(islice(self._by_status[status].values(), limit))
 
     def get_files_needing_processing(self) -> List[ProcessedFile]:
         """
@@ -203,7 +379,18 @@ class FileMonitorService:
             return False
 
         file_obj = self._tracked_files[file_id]
-        file_obj.update_status(new_status, reason)
+        old_status = file_obj.metadata.status
+        self._set_status(file_obj, new_status, reason)
+
+        # Queue only real transitions, so re-applying a decision isn't reported again
+        if new_status != old_status and new_status in DECISION_ACTIONS:
+            self._pending_decisions.append({
+                "decision_id": uuid.uuid4().hex,
+                "file_id": file_id,
+                "action": DECISION_ACTIONS[new_status],
+                "reason": reason,
+                "timestamp": datetime.now().isoformat()
+            })
 
         if new_location:
             file_obj.current_location = new_location
@@ -212,16 +399,51 @@ class FileMonitorService:
         logger.info(f"Updated file {file_id} status to {new_status}")
         return True
 
+    def has_pending_decisions(self) -> bool:
+        """Whether any approvals/rejections are waiting to be acknowledged."""
+        return bool(self._pending_decisions)
+
+    def get_pending_decisions(self) -> List[Dict[str, Any]]:
+        """
+        Get the approvals/rejections not yet acknowledged, oldest first.
+
+        Decisions are queued as statuses change, so collecting them doesn't
+        walk the tracked files or their processing history. They stay queued
+        (and in the state file) until acknowledge_decisions() is called, so a
+        dropped response or a restart doesn't lose them.
+        """
+        return list(self._pending_decisions)
+
+    def acknowledge_decisions(self, decision_ids: Iterable[str]) -> int:
+        """
+        Remove delivered decisions from the queue.
+
+        Args:
+            decision_ids: IDs of the decisions the workflow has received
+
+        Returns:
+            Number of decisions removed; unknown IDs are ignored
+        """
+        acknowledged = set(decision_ids)
+        remaining = [d for d in self._pending_decisions if d["decision_id"] not in acknowledged]
+        removed = len(self._pending_decisions) - len(remaining)
+
+        if removed:
+            self._pending_decisions.clear()
+            self._pending_decisions.extend(remaining)
+            self._save_state()
+        return removed
+
     def get_file_by_id(self, file_id: str) -> Optional[ProcessedFile]:
         """Get a file by its ID."""
         return self._tracked_files.get(file_id)
 
     def get_file_by_checksum(self, checksum: str) -> Optional[ProcessedFile]:
         """Find a file by its checksum (for duplicate detection)."""
-        for file_obj in self._tracked_files.values():
-            if file_obj.metadata.checksum_sha256 == checksum:
-                return file_obj
-        return None
+        file_id = self._checksum_index.get(checksum)
+        if file_id is None:
+            return None
+        return self._tracked_files.get(file_id)
 
     def scan_and_recover_incomplete(self) -> List[ProcessedFile]:
         """
@@ -232,25 +454,26 @@ class FileMonitorService:
         """
         recovered_files = []
 
-        for file_obj in self._tracked_files.values():
-            if file_obj.metadata.status == FileStatus.PROCESSING:
-                # Check if file has been processing for too long
-                last_update = file_obj.metadata.created_at
-                if file_obj.processing_history:
-                    last_step_time = max(
-                        datetime.fromisoformat(step.get('timestamp', '1970-01-01T00:00:00'))
-                        for step in file_obj.processing_history
-                    )
-                    last_update = max(last_update, last_step_time)
-
-                time_since_update = datetime.now() - last_update
-                if time_since_update.total_seconds() > settings.processing.processing_timeout_seconds:
-                    file_obj.update_status(
-                        FileStatus.FAILED,
-                        f"Processing timeout after {time_since_update.total_seconds()}s"
-                    )
-                    recovered_files.append(file_obj)
-                    logger.warning(f"Marked file {file_obj.metadata.file_id} as failed due to timeout")
+        # Copy the bucket, since timed-out files move out of it
+        for file_obj in list(self._by_status[FileStatus.PROCESSING].values()):
+            # Check if file has been processing for too long
+            last_update = file_obj.metadata.created_at
+            if file_obj.processing_history:
+                # Steps are appended as they happen, so the last one is the newest
+                last_step_time = datetime.fromisoformat(
+                    file_obj.processing_history[-1].get('timestamp', '1970-01-01T00:00:00')
+                )
+                last_update = max(last_update, last_step_time)
+
+            time_since_update = datetime.now() - last_update
+            if time_since_update.total_seconds() > settings.processing.processing_timeout_seconds:
+                self._set_status(
+                    file_obj,
+                    FileStatus.FAILED,
+                    f"Processing timeout after {time_since_update.total_seconds()}s"
+                )
+                recovered_files.append(file_obj)
+                logger.warning(f"Marked file {file_obj.metadata.file_id} as failed due to timeout")
 
         if recovered_files:
             self._save_state()
@@ -284,11 +507,13 @@ class FileMonitorService:
         self._save_state()
         return True
 
+    def status_counts(self) -> Dict[FileStatus, int]:
+        """Number of tracked files in each status, without walking the files."""
+        return {status: len(self._by_status[status]) for status in FileStatus}
+
     def get_statistics(self) -> Dict[str, int]:
         """Get file processing statistics."""
-        stats = {}
-        for status in FileStatus:
-            stats[status.value] = len(self.get_files_by_status(status))
+        stats = {status.value: count for status, count in self.status_counts().items()}
 
         stats['total'] = len(self._tracked_files)
         return stats
@@ -296,6 +521,14 @@ class FileMonitorService:
     def reset_state(self) -> None:
         """Reset all tracking state (for debugging/maintenance)."""
         self._tracked_files.clear()
+        self._checksum_index.clear()
+        self._by_status.clear()
+        self.status_version += 1
+        self._pending_decisions.clear()
+        self._seen_entries.clear()
+        self._stability.clear()
+        self._settled_dir_mtime_ns = None
+        self._last_full_scan = 0.0
         if self.state_file.exists():
             self.state_file.unlink()
         logger.warning("File monitor state has been reset")
\ No newline at end of file
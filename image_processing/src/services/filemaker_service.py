@@ -1,9 +1,13 @@
 # ===== src/services/filemaker_service.py =====
 import logging
+import queue
 import sqlite3
 import socket
 import json
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 from ..config.settings import settings
@@ -12,6 +16,9 @@ from ..utils.error_handling import handle_processing_errors
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on cached part metadata entries; oldest entries are evicted first
+METADATA_CACHE_MAX_ENTRIES = 10000
+
 
 class FileMakerService:
     """
@@ -26,8 +33,16 @@ class FileMakerService:
 
     def __init__(self):
         self.connection = None
-        self.metadata_cache: Dict[str, PartMetadata] = {}
+        # part number -> (expiry on the monotonic clock, metadata)
+        self.metadata_cache: Dict[str, Tuple[float, PartMetadata]] = {}
         self.is_mock_mode = settings.environment == "development"
+        # Opens another connection like the one that succeeded; None when
+        # extra connections aren't possible (mock database)
+        self._connection_factory: Optional[Callable[[], Any]] = None
+        # Idle per-query connections, most recently used first
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+        self._pool_opened = 0
+        self._pool_lock = threading.Lock()
         self._initialize_connection()
 
     def _initialize_connection(self) -> None:
@@ -154,6 +169,12 @@ class FileMakerService:
 
     def _try_odbc_connection(self) -> None:
         """Try ODBC connection."""
+        self.connection = self._open_odbc_connection()
+        self._connection_factory = self._open_odbc_connection
+        logger.info("FileMaker ODBC connection successful")
+
+    def _open_odbc_connection(self) -> Any:
+        """Open a FileMaker connection through ODBC."""
         try:
             import pyodbc
         except ImportError:
@@ -166,12 +187,18 @@ class FileMakerService:
         with open(dsn_path, 'r') as f:
             dsn = f.read().strip()
 
-        self.connection = pyodbc.connect(dsn, timeout=10)
-        self.connection.setencoding(encoding="utf8")
-        logger.info("FileMaker ODBC connection successful")
+        connection = pyodbc.connect(dsn, timeout=10)
+        connection.setencoding(encoding="utf8")
+        return connection
 
     def _try_jdbc_connection(self) -> None:
         """Try JDBC connection as fallback."""
+        self.connection = self._open_jdbc_connection()
+        self._connection_factory = self._open_jdbc_connection
+        logger.info("FileMaker JDBC connection successful")
+
+    def _open_jdbc_connection(self) -> Any:
+        """Open a FileMaker connection through JDBC."""
         try:
             import jpype
             import jaydebeapi
@@ -193,14 +220,14 @@ class FileMakerService:
             jpype.startJVM(jvm_path, f"-Djava.class.path={jar_path}")
 
         # Create connection
-        self.connection = jaydebeapi.connect(
+        connection = jaydebeapi.connect(
             "com.filemaker.jdbc.Driver",
             jdbc_url,
             [settings.database.filemaker_username, settings.database.filemaker_password]
         )
 
-        self.connection.jconn.setReadOnly(True)
-        logger.info("FileMaker JDBC connection successful")
+        connection.jconn.setReadOnly(True)
+        return connection
 
     def _find_jdbc_driver(self) -> str:
         """Find the FileMaker JDBC driver JAR file."""
@@ -216,6 +243,84 @@ class FileMakerService:
 
         raise Exception("fmjdbc.jar not found. Please place it in the config directory.")
 
+    @contextmanager
+    def _pooled_connection(self) -> Iterator[Any]:
+        """
+        Borrow a connection for one query.
+
+        Concurrent callers (web requests on separate threads) each get their
+        own warm connection instead of sharing self.connection, which the
+        ODBC/JDBC drivers don't support. Connections are opened on demand up
+        to settings.database.pool_size and kept for reuse. The mock database
+        only has the primary connection.
+        """
+        if self._connection_factory is None:
+            yield self.connection
+            return
+
+        while True:
+            try:
+                connection = self._pool.get_nowait()
+                break
+            except queue.Empty:
+                pass
+
+            with self._pool_lock:
+                can_open = self._pool_opened < settings.database.pool_size
+                if can_open:
+                    self._pool_opened += 1
+            if can_open:
+                try:
+                    connection = self._connection_factory()
+                except Exception:
+                    with self._pool_lock:
+                        self._pool_opened -= 1
+                    raise
+                break
+
+            # All connections are busy; wait for one to come back or for a
+            # discarded one to free its slot
+            try:
+                connection = self._pool.get(timeout=1.0)
+                break
+            except queue.Empty:
+                continue
+
+        try:
+            yield connection
+        except Exception:
+            # The connection may be broken; open a fresh one next time
+            self._discard_pooled_connection(connection)
+            raise
+        self._pool.put(connection)
+
+    def _discard_pooled_connection(self, connection: Any) -> None:
+        """Close a pooled connection and free its slot."""
+        with self._pool_lock:
+            self._pool_opened -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _cached_metadata(self, part_key: str) -> Optional[PartMetadata]:
+        """Return cached metadata for a part if it hasn't expired."""
+        entry = self.metadata_cache.get(part_key)
+        if entry is None:
+            return None
+        expires_at, metadata = entry
+        if time.monotonic() >= expires_at:
+            self.metadata_cache.pop(part_key, None)
+            return None
+        return metadata
+
+    def _cache_metadata(self, part_key: str, metadata: PartMetadata) -> None:
+        """Cache metadata for a part for the configured time."""
+        if part_key not in self.metadata_cache and len(self.metadata_cache) >= METADATA_CACHE_MAX_ENTRIES:
+            self.metadata_cache.pop(next(iter(self.metadata_cache)), None)
+        expires_at = time.monotonic() + settings.database.metadata_cache_seconds
+        self.metadata_cache[part_key] = (expires_at, metadata)
+
     @handle_processing_errors("database_query")
     def get_part_metadata(self, part_number: str) -> Optional[PartMetadata]:
         """
@@ -233,12 +338,11 @@ class FileMakerService:
 
         # Check cache first
         part_key = part_number.upper().strip()
-        if part_key in self.metadata_cache:
-            return self.metadata_cache[part_key]
+        cached = self._cached_metadata(part_key)
+        if cached is not None:
+            return cached
 
         try:
-            cursor = self.connection.cursor()
-
             if self.is_mock_mode and hasattr(self.connection, 'row_factory'):
                 # SQLite query
                 query = """
@@ -268,12 +372,14 @@ class FileMakerService:
                           AND m.ToggleActive = 'Yes' \
                         """
 
-            cursor.execute(query, (part_key,))
-            row = cursor.fetchone()
+            with self._pooled_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, (part_key,))
+                row = cursor.fetchone()
+                cursor.close()
 
             if not row:
                 logger.debug(f"No metadata found for part: {part_number}")
-                cursor.close()
                 return None
 
             # Handle both SQLite Row and regular tuple results
@@ -314,8 +420,7 @@ class FileMakerService:
             )
 
             # Cache the result
-            self.metadata_cache[part_key] = metadata
-            cursor.close()
+            self._cache_metadata(part_key, metadata)
 
             logger.debug(f"Retrieved metadata for part: {part_number}")
             return metadata
@@ -324,6 +429,93 @@ class FileMakerService:
             logger.error(f"Error querying part metadata for {part_number}: {e}")
             return None
 
+    @handle_processing_errors("database_query")
+    def get_part_metadata_bulk(self, part_numbers: List[str]) -> Dict[str, PartMetadata]:
+        """
+        Get metadata for several part numbers with one query.
+
+        Args:
+            part_numbers: Part numbers to look up
+
+        Returns:
+            Dictionary mapping each found part number (upper case) to its
+            PartMetadata; parts that don't exist or aren't active are left out
+        """
+        if not self.connection:
+            logger.warning("No database connection available")
+            return {}
+
+        results = {}
+        missing = []
+        for part_number in part_numbers:
+            part_key = part_number.upper().strip()
+            cached = self._cached_metadata(part_key)
+            if cached is not None:
+                results[part_key] = cached
+            elif part_key not in missing:
+                missing.append(part_key)
+
+        if not missing:
+            return results
+
+        try:
+            placeholders = ", ".join("?" * len(missing))
+            if self.is_mock_mode and hasattr(self.connection, 'row_factory'):
+                # SQLite query
+                query = f"""
+                        SELECT AS400_NumberStripped,
+                               PartBrand,
+                               PartDescription,
+                               SDC_DescriptionShort,
+                               SDC_PartDescriptionExtended,
+                               SDC_KeySearchWords,
+                               SDC_SlangDescription
+                        FROM Master
+                        WHERE AS400_NumberStripped IN ({placeholders})
+                          AND ToggleActive = 'Yes'
+                        """
+            else:
+                # FileMaker query
+                query = f"""
+                        SELECT m.AS400_NumberStripped AS PartNumber,
+                               m.PartBrand,
+                               m.PartDescription,
+                               m.SDC_DescriptionShort,
+                               m.SDC_PartDescriptionExtended,
+                               m.SDC_KeySearchWords,
+                               m.SDC_SlangDescription
+                        FROM Master AS m
+                        WHERE m.AS400_NumberStripped IN ({placeholders})
+                          AND m.ToggleActive = 'Yes'
+                        """
+
+            with self._pooled_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, missing)
+                rows = cursor.fetchall()
+                cursor.close()
+
+            for row in rows:
+                if not row[0]:
+                    continue
+                keywords_parts = [row[5] or "", row[6] or "", row[1] or ""]
+                metadata = PartMetadata(
+                    part_number=row[0],
+                    part_brand=row[1] or "Crown Automotive",
+                    title=row[2] or row[3] or "",
+                    description=row[4] or "",
+                    keywords=", ".join(part for part in keywords_parts if part)
+                )
+                part_key = str(row[0]).upper().strip()
+                self._cache_metadata(part_key, metadata)
+                results[part_key] = metadata
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error querying part metadata for {len(missing)} parts: {e}")
+            return results
+
     @handle_processing_errors("interchange_query")
     def get_interchange_mappings(self) -> List[Tuple[str, str, str]]:
         """
@@ -337,8 +529,6 @@ class FileMakerService:
             return []
 
         try:
-            cursor = self.connection.cursor()
-
             if self.is_mock_mode and hasattr(self.connection, 'row_factory'):
                 # SQLite query
                 query = '''
@@ -354,9 +544,11 @@ class FileMakerService:
                         ORDER BY "i"."IPTNO", "i"."ICPCD" \
                         '''
 
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            cursor.close()
+            with self._pooled_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query)
+                rows = cursor.fetchall()
+                cursor.close()
 
             mappings = []
             for row in rows:
@@ -389,7 +581,6 @@ class FileMakerService:
             return []
 
         try:
-            cursor = self.connection.cursor()
             search_pattern = f"{search_term.upper()}%"
 
             if self.is_mock_mode and hasattr(self.connection, 'row_factory'):
@@ -423,9 +614,11 @@ class FileMakerService:
                         ORDER BY m.AS400_NumberStripped LIMIT ? \
                         """
 
-            cursor.execute(query, (search_pattern, limit))
-            rows = cursor.fetchall()
-            cursor.close()
+            with self._pooled_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, (search_pattern, limit))
+                rows = cursor.fetchall()
+                cursor.close()
 
             results = []
             for row in rows:
@@ -462,8 +655,6 @@ class FileMakerService:
             return False
 
         try:
-            cursor = self.connection.cursor()
-
             if self.is_mock_mode and hasattr(self.connection, 'row_factory'):
                 query = '''
                         SELECT COUNT(*) \
@@ -479,9 +670,11 @@ class FileMakerService:
                           AND ToggleActive = 'Yes' \
                         '''
 
-            cursor.execute(query, (part_number.upper().strip(),))
-            result = cursor.fetchone()
-            cursor.close()
+            with self._pooled_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, (part_number.upper().strip(),))
+                result = cursor.fetchone()
+                cursor.close()
 
             return result and result[0] > 0
 
@@ -495,10 +688,11 @@ class FileMakerService:
             return False
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM Master WHERE ToggleActive = 'Yes'")
-            result = cursor.fetchone()
-            cursor.close()
+            with self._pooled_connection() as connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT COUNT(*) FROM Master WHERE ToggleActive = 'Yes'")
+                result = cursor.fetchone()
+                cursor.close()
 
             return result and result[0] > 0
         except Exception as e:
@@ -507,6 +701,12 @@ class FileMakerService:
 
     def close_connection(self) -> None:
         """Close database connection."""
+        while True:
+            try:
+                self._discard_pooled_connection(self._pool.get_nowait())
+            except queue.Empty:
+                break
+
         if self.connection:
             try:
                 self.connection.close()
@@ -21,6 +21,7 @@ from ..services.background_removal_service import BackgroundRemovalService
 from ..models.processing_models import BackgroundRemovalRequest, ProcessingResult
 from ..models.file_models import ProcessedFile, FileMetadata, FileType, FileStatus
 from ..utils.logging_config import setup_logging
+from ..utils.time_utils import coarse_now_iso
 
 # Setup logging
 setup_logging(settings.log_level)
@@ -94,12 +95,12 @@ async def update_file_status(file_id: str, status: str, reason: str = None, new_
     """Update file status via file monitor API."""
     try:
         async with httpx.AsyncClient() as client:
-            params = {"status": status}
+            data = {"status": status}
             if reason:
-                params["reason"] = reason
+                data["reason"] = reason
 
             response = await client.put(f"{FILE_MONITOR_URL}/files/{file_id}/status",
-                                        params=params)
+                                        json=data)
 
             # TODO: Add support for updating file location in the API
             # For now, we'll handle location updates separately if needed
@@ -139,7 +140,7 @@ async def health_check():
 
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": coarse_now_iso(),
         "services": {
             "background_removal": bg_removal_service is not None,
             "file_monitor_api": file_monitor_healthy
@@ -231,7 +232,7 @@ async def get_status():
         return {
             "service": "Crown Automotive ML Processor",
             "status": "running",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": coarse_now_iso(),
             "services": {
                 "background_removal": bg_removal_service is not None,
             },
@@ -244,7 +245,7 @@ async def get_status():
             "service": "Crown Automotive ML Processor",
             "status": "error",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": coarse_now_iso()
         }
 
 
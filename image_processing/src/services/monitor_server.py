@@ -4,17 +4,27 @@ File Monitor Server - Clean Architecture Implementation
 Provides REST API for file monitoring and change detection
 """
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 from ..config.settings import settings
+from ..models.file_models import FileStatus, ProcessedFile
 from ..services.file_monitor_service import FileMonitorService
 from ..utils.logging_config import setup_logging
+from ..utils.time_utils import coarse_now_iso
+
+try:
+    from watchfiles import Change, awatch
+except ImportError:
+    awatch = None
 
 # Setup logging
 setup_logging(settings.log_level)
@@ -30,6 +40,15 @@ app = FastAPI(
 # Global file monitor instance
 file_monitor: FileMonitorService = None
 
+# Status value -> FileStatus, for validating updates without try/except
+FILE_STATUSES: Dict[str, FileStatus] = {status.value: status for status in FileStatus}
+
+# Longest a /decisions/pending poll may wait for a decision to arrive
+MAX_DECISION_WAIT_SECONDS = 25.0
+
+# Set when a status update queues a review decision, waking long polls
+decision_queued = asyncio.Event()
+
 
 class FileChangeResponse(BaseModel):
     """Response model for file changes."""
@@ -53,6 +72,57 @@ class FileDetailResponse(BaseModel):
     checksum: str
 
 
+class StatusUpdateRequest(BaseModel):
+    """Request model for file status updates."""
+    status: str
+    reason: Optional[str] = None
+
+
+class PartNumberUpdateRequest(BaseModel):
+    """Request model for file part number updates."""
+    part_number: str
+    confidence: float = 1.0
+
+
+class DecisionAckRequest(BaseModel):
+    """Request model for acknowledging delivered review decisions."""
+    decision_ids: List[str]
+
+
+def _file_summaries(files: List[ProcessedFile]) -> List[Dict[str, Any]]:
+    """Build the per-file entries for FileChangeResponse."""
+    return [
+        {
+            "file_id": f.metadata.file_id,
+            "filename": f.metadata.filename,
+            "file_type": f.metadata.file_type,
+            "size_mb": f.metadata.size_mb,
+            "is_psd": f.metadata.is_psd,
+            "path": f.current_location_str,
+            "checksum": f.metadata.checksum_sha256,
+            "status": f.metadata.status
+        }
+        for f in files
+    ]
+
+
+def _json_response(payload: Dict[str, Any]) -> Response:
+    """Serialize a trusted, internally built payload straight to JSON bytes."""
+    return Response(content=orjson.dumps(payload, default=str), media_type="application/json")
+
+
+def _file_change_response(files: List[ProcessedFile]) -> Response:
+    """Build a FileChangeResponse payload without model validation."""
+    payload = {
+        "timestamp": coarse_now_iso(),
+        "scan_directory": app.state.input_dir_str,
+        "new_files_count": len(files),
+        "new_files": _file_summaries(files),
+        "total_monitored": len(file_monitor._tracked_files)
+    }
+    return _json_response(payload)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize file monitor on startup."""
@@ -61,23 +131,44 @@ async def startup_event():
     try:
         logger.info("Initializing file monitor...")
         file_monitor = FileMonitorService()
+
+        # Paths are fixed for the process lifetime; stringify them once
+        app.state.input_dir_str = str(file_monitor.input_dir)
+        app.state.state_file_str = str(file_monitor.state_file)
+
+        if settings.processing.watch_input_dir and awatch is not None:
+            file_monitor.start_watching()
+            app.state.watch_task = asyncio.create_task(watch_input_dir())
+
         logger.info(f"File monitor initialized, watching: {file_monitor.input_dir}")
     except Exception as e:
         logger.error(f"Failed to initialize file monitor: {e}")
         raise
 
 
+async def watch_input_dir():
+    """Feed added/modified input files to the monitor as they happen."""
+    try:
+        async for changes in awatch(file_monitor.input_dir, recursive=False):
+            file_monitor.notify_changes(
+                Path(path) for change, path in changes if change != Change.deleted
+            )
+    except Exception as e:
+        logger.error(f"Input directory watcher stopped, falling back to polling: {e}")
+    file_monitor.stop_watching()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "monitoring": str(file_monitor.input_dir) if file_monitor else None
+        "timestamp": coarse_now_iso(),
+        "monitoring": app.state.input_dir_str if file_monitor else None
     }
 
 
-@app.get("/scan", response_model=FileChangeResponse)
+@app.get("/scan", response_class=Response, responses={200: {"model": FileChangeResponse}})
 async def scan_for_changes():
     """Scan for new files and return changes."""
     try:
@@ -86,32 +177,14 @@ async def scan_for_changes():
 
         new_files = file_monitor.discover_new_files()
 
-        return FileChangeResponse(
-            timestamp=datetime.now().isoformat(),
-            scan_directory=str(file_monitor.input_dir),
-            new_files_count=len(new_files),
-            new_files=[
-                {
-                    "file_id": f.metadata.file_id,
-                    "filename": f.metadata.filename,
-                    "file_type": f.metadata.file_type,
-                    "size_mb": f.metadata.size_mb,
-                    "is_psd": f.metadata.is_psd,
-                    "path": str(f.current_location),
-                    "checksum": f.metadata.checksum_sha256,
-                    "status": f.metadata.status
-                }
-                for f in new_files
-            ],
-            total_monitored=len(file_monitor._tracked_files)
-        )
+        return _file_change_response(new_files)
 
     except Exception as e:
         logger.error(f"Scan error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/processable", response_model=FileChangeResponse)
+@app.get("/processable", response_class=Response, responses={200: {"model": FileChangeResponse}})
 async def get_processable_files():
     """Get files that need processing (including recovery from failures)."""
     try:
@@ -124,32 +197,42 @@ async def get_processable_files():
         # Get all files needing processing
         processable_files = file_monitor.get_files_needing_processing()
 
-        return FileChangeResponse(
-            timestamp=datetime.now().isoformat(),
-            scan_directory=str(file_monitor.input_dir),
-            new_files_count=len(processable_files),
-            new_files=[
-                {
-                    "file_id": f.metadata.file_id,
-                    "filename": f.metadata.filename,
-                    "file_type": f.metadata.file_type,
-                    "size_mb": f.metadata.size_mb,
-                    "is_psd": f.metadata.is_psd,
-                    "path": str(f.current_location),
-                    "status": f.metadata.status,
-                    "checksum": f.metadata.checksum_sha256
-                }
-                for f in processable_files
-            ],
-            total_monitored=len(file_monitor._tracked_files)
-        )
+        return _file_change_response(processable_files)
 
     except Exception as e:
         logger.error(f"Processable files error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/files/{file_id}", response_model=FileDetailResponse)
+@app.get("/files")
+async def list_files_by_status(status: str, limit: int = 100):
+    """List up to `limit` tracked files with the given status."""
+    try:
+        if not file_monitor:
+            raise HTTPException(status_code=503, detail="File monitor not initialized")
+
+        status_enum = FILE_STATUSES.get(status)
+        if status_enum is None:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+
+        # Served from the monitor's per-status index, not a scan of every file
+        files = file_monitor.get_files_by_status(status_enum, limit=max(limit, 0))
+
+        return _json_response({
+            "status": status,
+            "count": file_monitor.status_counts()[status_enum],
+            "files": _file_summaries(files),
+            "timestamp": coarse_now_iso()
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"List files error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/files/{file_id}", response_class=Response, responses={200: {"model": FileDetailResponse}})
 async def get_file_by_id(file_id: str):
     """Get detailed file information by ID."""
     try:
@@ -160,17 +243,17 @@ async def get_file_by_id(file_id: str):
         if not file_obj:
             raise HTTPException(status_code=404, detail=f"File not found: {file_id}")
 
-        return FileDetailResponse(
-            file_id=file_obj.metadata.file_id,
-            filename=file_obj.metadata.filename,
-            file_type=file_obj.metadata.file_type.value,
-            size_mb=file_obj.metadata.size_mb,
-            status=file_obj.metadata.status.value,
-            current_location=str(file_obj.current_location) if file_obj.current_location else "",
-            part_number=file_obj.part_number,
-            processing_history=file_obj.processing_history,
-            checksum=file_obj.metadata.checksum_sha256
-        )
+        return _json_response({
+            "file_id": file_obj.metadata.file_id,
+            "filename": file_obj.metadata.filename,
+            "file_type": file_obj.metadata.file_type.value,
+            "size_mb": file_obj.metadata.size_mb,
+            "status": file_obj.metadata.status.value,
+            "current_location": file_obj.current_location_str,
+            "part_number": file_obj.part_number,
+            "processing_history": file_obj.processing_history,
+            "checksum": file_obj.metadata.checksum_sha256
+        })
 
     except HTTPException:
         raise
@@ -180,17 +263,17 @@ async def get_file_by_id(file_id: str):
 
 
 @app.put("/files/{file_id}/status")
-async def update_file_status(file_id: str, status: str, reason: str = None):
+async def update_file_status(file_id: str, update: StatusUpdateRequest):
     """Update file status."""
+    status = update.status
+    reason = update.reason
+
     try:
         if not file_monitor:
             raise HTTPException(status_code=503, detail="File monitor not initialized")
 
-        from ..models.file_models import FileStatus
-
-        try:
-            status_enum = FileStatus(status)
-        except ValueError:
+        status_enum = FILE_STATUSES.get(status)
+        if status_enum is None:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
 
         success = file_monitor.update_file_status(file_id, status_enum, reason)
@@ -198,12 +281,15 @@ async def update_file_status(file_id: str, status: str, reason: str = None):
         if not success:
             raise HTTPException(status_code=404, detail=f"File not found: {file_id}")
 
+        if file_monitor.has_pending_decisions():
+            decision_queued.set()
+
         return {
             "success": True,
             "file_id": file_id,
             "new_status": status,
             "reason": reason,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": coarse_now_iso()
         }
 
     except HTTPException:
@@ -213,9 +299,70 @@ async def update_file_status(file_id: str, status: str, reason: str = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/decisions/pending")
+async def get_pending_decisions(wait: float = 0.0):
+    """
+    List approvals/rejections not yet acknowledged through /decisions/ack.
+
+    With ``wait`` set and nothing pending, hold the request open until a
+    decision arrives or ``wait`` seconds (at most 25) pass.
+    """
+    try:
+        if not file_monitor:
+            raise HTTPException(status_code=503, detail="File monitor not initialized")
+
+        if wait > 0 and not file_monitor.has_pending_decisions():
+            decision_queued.clear()
+            try:
+                await asyncio.wait_for(
+                    decision_queued.wait(), timeout=min(wait, MAX_DECISION_WAIT_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        decisions = file_monitor.get_pending_decisions()
+
+        return {
+            "decisions": decisions,
+            "count": len(decisions),
+            "timestamp": coarse_now_iso()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Pending decisions error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/decisions/ack")
+async def acknowledge_decisions(ack: DecisionAckRequest):
+    """Remove delivered decisions so later polls don't return them again."""
+    try:
+        if not file_monitor:
+            raise HTTPException(status_code=503, detail="File monitor not initialized")
+
+        acknowledged = file_monitor.acknowledge_decisions(ack.decision_ids)
+
+        return {
+            "success": True,
+            "acknowledged": acknowledged,
+            "timestamp": coarse_now_iso()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Decision acknowledgement error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.put("/files/{file_id}/part_number")
-async def update_file_part_number(file_id: str, part_number: str, confidence: float = 1.0):
+async def update_file_part_number(file_id: str, update: PartNumberUpdateRequest):
     """Update file part number."""
+    part_number = update.part_number
+    confidence = update.confidence
+
     try:
         if not file_monitor:
             raise HTTPException(status_code=503, detail="File monitor not initialized")
@@ -230,7 +377,7 @@ async def update_file_part_number(file_id: str, part_number: str, confidence: fl
             "file_id": file_id,
             "part_number": part_number,
             "confidence": confidence,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": coarse_now_iso()
         }
 
     except HTTPException:
@@ -249,10 +396,14 @@ async def get_status():
 
         return {
             "status": "running",
-            "watch_directory": str(file_monitor.input_dir),
-            "state_file": str(file_monitor.state_file),
+            "watch_directory": app.state.input_dir_str,
+            "state_file": app.state.state_file_str,
             "total_tracked_files": len(file_monitor._tracked_files),
-            "last_scan": datetime.now().isoformat()
+            "status_version": file_monitor.status_version,
+            "status_counts": {
+                status.value: count for status, count in file_monitor.status_counts().items()
+            },
+            "last_scan": coarse_now_iso()
         }
 
     except Exception as e:
@@ -265,9 +416,7 @@ async def reset_monitor():
     """Reset file monitor state."""
     try:
         if file_monitor:
-            file_monitor._tracked_files = {}
-            if file_monitor.state_file.exists():
-                file_monitor.state_file.unlink()
+            file_monitor.reset_state()
 
             return {"status": "reset", "message": "File monitor state cleared"}
         else:
@@ -282,12 +431,17 @@ def main():
     """Main entry point."""
     logger.info("Starting Crown Automotive File Monitor...")
 
+    # Tracked-file state lives in this process (and its state file), so the
+    # monitor must run as a single worker; it still gets uvloop/httptools.
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=8002,
+        workers=1,
+        loop=settings.server.loop,
+        http=settings.server.http,
         log_level="info",
-        access_log=True
+        access_log=settings.server.access_log
     )
 
 
@@ -7,11 +7,13 @@ import os
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 import requests
 from jinja2 import Environment, DictLoader
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..config.settings import settings
 from ..utils.error_handling import handle_processing_errors
@@ -37,9 +39,29 @@ class NotificationService:
         # Initialize message templates
         self.templates = Environment(loader=DictLoader(self._get_message_templates()))
 
+        # Reuse one keep-alive session so each notification doesn't pay for
+        # a new TCP/TLS handshake with the webhook host
+        self._session = self._create_session()
+
         if not self.webhook_configured:
             logger.warning("Teams webhook URL not configured - notifications will be skipped")
 
+    def _create_session(self) -> requests.Session:
+        """Create an HTTP session with connection pooling and retries."""
+        session = requests.Session()
+        session.headers.update({'Content-Type': 'application/json'})
+
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None  # Include POST: a duplicate card beats a lost one
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def _get_message_templates(self) -> Dict[str, str]:
         """Get Teams message templates."""
         return {
@@ -184,6 +206,35 @@ class NotificationService:
             '''
         }
 
+    def _render_card(self, template_name: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Render a message template into a Teams MessageCard."""
+        # Add base context
+        context.update({
+            "base_url": self.base_url,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        # Render message template
+        if template_name not in self.templates.list_templates():
+            raise ValueError(f"Unknown template: {template_name}")
+
+        template = self.templates.get_template(template_name)
+        message_json = template.render(context)
+
+        # Parse JSON to validate
+        return json.loads(message_json)
+
+    def _post_card(self, message_data: Dict[str, Any]) -> requests.Response:
+        """Send a MessageCard to the Teams webhook."""
+        response = self._session.post(
+            self.webhook_url,
+            json=message_data,
+            timeout=30
+        )
+
+        response.raise_for_status()
+        return response
+
     @handle_processing_errors("teams_notification")
     def send_notification(self, template_name: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -201,31 +252,10 @@ class NotificationService:
             return {"status": "skipped", "reason": "Webhook not configured"}
 
         try:
-            # Add base context
-            context.update({
-                "base_url": self.base_url,
-                "timestamp": datetime.now().isoformat()
-            })
-
-            # Render message template
-            if template_name not in self.templates.list_templates():
-                raise ValueError(f"Unknown template: {template_name}")
-
-            template = self.templates.get_template(template_name)
-            message_json = template.render(context)
-
-            # Parse JSON to validate
-            message_data = json.loads(message_json)
+            message_data = self._render_card(template_name, context)
 
             # Send to Teams
-            response = requests.post(
-                self.webhook_url,
-                json=message_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
-
-            response.raise_for_status()
+            response = self._post_card(message_data)
 
             logger.info(f"Teams notification sent successfully: {template_name}")
 
@@ -243,6 +273,88 @@ class NotificationService:
                 "template": template_name
             }
 
+    @handle_processing_errors("teams_notification")
+    def send_notifications(self, template_name: str, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several notifications of one template as a single Teams card.
+
+        Each notification becomes a section of the combined card, so a burst
+        (e.g. a bulk file drop) costs one webhook call instead of one per file.
+        Actions that differ between notifications (e.g. per-file review links)
+        move onto their own section. A context that fails to render fails only
+        its own notification.
+
+        Args:
+            template_name: Name of the message template to use
+            contexts: Context data for each notification
+
+        Returns:
+            Sending result for each context, in order
+        """
+        if len(contexts) == 1:
+            return [self.send_notification(template_name, contexts[0])]
+
+        if not self.webhook_configured:
+            logger.debug(f"Skipping {len(contexts)} Teams notifications '{template_name}' - webhook not configured")
+            return [{"status": "skipped", "reason": "Webhook not configured"}] * len(contexts)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(contexts)
+        cards = []
+        for index, context in enumerate(contexts):
+            try:
+                cards.append((index, self._render_card(template_name, context)))
+            except Exception as e:
+                logger.error(f"Error rendering Teams notification '{template_name}': {e}")
+                results[index] = {"status": "error", "error": str(e), "template": template_name}
+
+        if cards:
+            try:
+                message_data = self._merge_cards([card for _, card in cards])
+                response = self._post_card(message_data)
+
+                logger.info(f"Teams notification batch sent successfully: {template_name} x{len(cards)}")
+                sent = {
+                    "status": "success",
+                    "template": template_name,
+                    "status_code": response.status_code,
+                    "batched": len(cards)
+                }
+
+            except Exception as e:
+                logger.error(f"Error sending Teams notification batch: {e}")
+                sent = {"status": "error", "error": str(e), "template": template_name}
+
+            for index, _ in cards:
+                results[index] = sent
+
+        return results
+
+    @staticmethod
+    def _merge_cards(cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine rendered MessageCards into one, keeping every card's actions."""
+        if len(cards) == 1:
+            return cards[0]
+
+        message_data = dict(cards[0])
+        message_data["summary"] = f"{len(cards)} notifications: {message_data.get('summary', '')}"
+
+        actions = [card.get("potentialAction", []) for card in cards]
+        if all(card_actions == actions[0] for card_actions in actions):
+            # Same actions for every notification (e.g. "View Dashboard"): show them once
+            sections = [section for card in cards for section in card.get("sections", [])]
+        else:
+            # Per-notification actions go on that notification's first section
+            message_data.pop("potentialAction", None)
+            sections = []
+            for card, card_actions in zip(cards, actions):
+                card_sections = [dict(section) for section in card.get("sections", [])] or [{}]
+                if card_actions:
+                    card_sections[0]["potentialAction"] = card_actions
+                sections.extend(card_sections)
+
+        message_data["sections"] = sections
+        return message_data
+
     def notify_file_discovered(self, file_obj) -> Dict[str, Any]:
         """Notify that a new file has been discovered."""
         context = {
@@ -4,9 +4,9 @@ Teams Notifier Server - Clean Architecture Implementation
 Provides REST API for sending Teams notifications
 """
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 import uvicorn
 from fastapi import FastAPI, HTTPException
@@ -15,6 +15,7 @@ from pydantic import BaseModel
 from ..config.settings import settings
 from ..services.notification_service import NotificationService
 from ..utils.logging_config import setup_logging
+from ..utils.time_utils import coarse_now_iso
 
 # Setup logging
 setup_logging(settings.log_level)
@@ -30,6 +31,13 @@ app = FastAPI(
 # Global notifier instance
 notifier: NotificationService = None
 
+# Notifications arriving within this window are coalesced into one card
+NOTIFY_BATCH_WINDOW_SECONDS = 0.5
+NOTIFY_MAX_BATCH = 10
+
+# (template_name, context, result future) waiting to be sent
+notify_queue: Optional[asyncio.Queue] = None
+
 
 class NotificationRequest(BaseModel):
     """Request model for notifications."""
@@ -40,23 +48,73 @@ class NotificationRequest(BaseModel):
 @app.on_event("startup")
 async def startup_event():
     """Initialize notifier on startup."""
-    global notifier
+    global notifier, notify_queue
 
     try:
         logger.info("Initializing Teams notifier...")
         notifier = NotificationService()
+
+        notify_queue = asyncio.Queue()
+        app.state.drain_task = asyncio.create_task(drain_notifications())
+
         logger.info("Teams notifier initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize Teams notifier: {e}")
         raise
 
 
+async def drain_notifications():
+    """Send queued notifications, coalescing bursts of the same template."""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        batch = [await notify_queue.get()]
+        deadline = loop.time() + NOTIFY_BATCH_WINDOW_SECONDS
+
+        while len(batch) < NOTIFY_MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(notify_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        groups: Dict[str, List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        for template_name, context, future in batch:
+            groups.setdefault(template_name, []).append((context, future))
+
+        for template_name, items in groups.items():
+            try:
+                results = await asyncio.to_thread(
+                    notifier.send_notifications, template_name, [context for context, _ in items]
+                )
+            except Exception as e:
+                results = [{"status": "error", "error": str(e), "template": template_name}] * len(items)
+
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the notification drain task."""
+    drain_task = getattr(app.state, "drain_task", None)
+    if drain_task:
+        drain_task.cancel()
+        try:
+            await drain_task
+        except asyncio.CancelledError:
+            pass
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": coarse_now_iso(),
         "webhook_configured": bool(notifier and notifier.webhook_configured) if notifier else False
     }
 
@@ -68,13 +126,15 @@ async def send_notification(request: NotificationRequest) -> Dict[str, Any]:
         if not notifier:
             raise HTTPException(status_code=503, detail="Notifier not initialized")
 
-        result = notifier.send_notification(request.template_name, request.context)
+        future = asyncio.get_running_loop().create_future()
+        await notify_queue.put((request.template_name, request.context, future))
+        result = await future
 
         return {
             "success": result.get("status") == "success",
             "message": result.get("error", "Notification sent successfully"),
             "template": request.template_name,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": coarse_now_iso()
         }
 
     except Exception as e:
@@ -89,7 +149,7 @@ async def get_status():
         return {
             "status": "running",
             "webhook_configured": bool(notifier and notifier.webhook_configured) if notifier else False,
-            "last_check": datetime.now().isoformat()
+            "last_check": coarse_now_iso()
         }
 
     except Exception as e:
@@ -101,12 +161,18 @@ def main():
     """Main entry point."""
     logger.info("Starting Crown Automotive Teams Notifier...")
 
+    # Notifications are batched through a queue in this process, so the
+    # notifier must run as a single worker for bursts to coalesce; it still
+    # gets uvloop/httptools.
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=8004,
+        workers=1,
+        loop=settings.server.loop,
+        http=settings.server.http,
         log_level="info",
-        access_log=True
+        access_log=settings.server.access_log
     )
 
 
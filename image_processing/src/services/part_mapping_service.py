@@ -4,9 +4,15 @@ Part Number Mapping Service - Clean Architecture Implementation
 Handles mapping image filenames to correct Crown part numbers using interchange tables
 """
 
+import bisect
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+import string
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 from pathlib import Path
 
 from ..config.settings import settings
@@ -14,8 +20,114 @@ from ..models.part_mapping_models import InterchangeMapping, PartMappingResult
 from ..services.filemaker_service import FileMakerService
 from ..utils.error_handling import handle_processing_errors, ProcessingError
 
+try:
+    from rapidfuzz import process as fuzz_process
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    fuzz_process = None
+
 logger = logging.getLogger(__name__)
 
+# Part-like sequences (letters + numbers); a hit at the start of the name is
+# the standard Crown part number and ranks first
+PART_SEQUENCE_PATTERN = re.compile(r'[A-Z]{0,2}+\d{4,8}+')
+# Remove trailing _number, (number) or a common suffix; the endings are
+# mutually exclusive, so one alternation covers all of them
+STEM_PATTERN = re.compile(r'^(.+?)(?>_\d++|\s*+\(\d++\)|_detail|_main|_front|_back|_top|_bottom)$')
+# Any leading sequence of letters and numbers
+LEADING_ALPHANUMERIC_PATTERN = re.compile(r'[A-Z0-9]{4,12}+')
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^A-Z0-9]')
+ASCII_ALPHANUMERIC = frozenset(string.ascii_uppercase + string.digits)
+ASCII_DIGITS = frozenset(string.digits)
+
+# Rows fetched per round-trip while loading the interchange table
+INTERCHANGE_FETCH_SIZE = 5000
+
+# Upper bound on memoized lookups per cache; oldest entries are evicted first
+PART_CACHE_MAX_ENTRIES = 4096
+
+# Part numbers per IN (...) list when checking many candidates at once
+BULK_CHECK_BATCH_SIZE = 500
+
+# Substring length indexed for in-memory fuzzy matching
+TRIGRAM_SIZE = 3
+
+# Minimum normalized Levenshtein similarity for an edit-distance match
+SIMILARITY_CUTOFF = 0.6
+
+# Part numbers offered for a manual override search
+MAX_OVERRIDE_SUGGESTIONS = 10
+
+
+def _simple_part_number(name: str) -> Optional[str]:
+    """
+    Return the part number of a plain "<part>", "<part>_N" or "<part> (N)" stem.
+
+    Only shapes for which the extraction patterns yield exactly that part
+    number are accepted; anything else returns None and goes through them.
+    """
+    end = 0
+    while end < len(name) and name[end] in ASCII_ALPHANUMERIC:
+        end += 1
+
+    part = name[:end]
+    digits = part.lstrip(string.ascii_uppercase)
+    if len(part) - len(digits) > 2 or not 4 <= len(digits) <= 8 or not ASCII_DIGITS.issuperset(digits):
+        return None
+
+    suffix = name[end:]
+    if not suffix:
+        return part
+
+    if suffix[0] == '_':
+        counter = suffix[1:]
+    elif suffix.lstrip(' ')[:1] == '(' and suffix[-1] == ')':
+        counter = suffix.lstrip(' ')[1:-1]
+    else:
+        return None
+
+    # Longer counters could hold another part-like digit run
+    if 1 <= len(counter) <= 3 and ASCII_DIGITS.issuperset(counter):
+        return part
+    return None
+
+
+def _trigrams(value: str) -> Set[str]:
+    """Return every TRIGRAM_SIZE-character window of a string."""
+    return {value[i:i + TRIGRAM_SIZE] for i in range(len(value) - TRIGRAM_SIZE + 1)}
+
+
+def _sift3(s1: str, s2: str, max_offset: int = 5) -> float:
+    """Approximate edit distance using the Sift3 algorithm."""
+    if not s1:
+        return len(s2)
+    if not s2:
+        return len(s1)
+
+    c = offset1 = offset2 = lcs = 0
+    while c + offset1 < len(s1) and c + offset2 < len(s2):
+        if s1[c + offset1] == s2[c + offset2]:
+            lcs += 1
+        else:
+            offset1 = offset2 = 0
+            for i in range(max_offset):
+                if c + i < len(s1) and s1[c + i] == s2[c]:
+                    offset1 = i
+                    break
+                if c + i < len(s2) and s1[c] == s2[c + i]:
+                    offset2 = i
+                    break
+        c += 1
+
+    return (len(s1) + len(s2)) / 2 - lcs
+
+
+def _cache_put(cache: Dict, key: str, value) -> None:
+    """Store a memoized value, evicting the oldest entry once the cache is full."""
+    if len(cache) >= PART_CACHE_MAX_ENTRIES:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
 
 class PartMappingService:
     """
@@ -30,9 +142,38 @@ class PartMappingService:
 
     def __init__(self):
         self.filemaker = FileMakerService()
-        self.interchange_cache: Dict[str, InterchangeMapping] = {}
-        self.part_cache: Dict[str, str] = {}
+        # Old part number -> (new part number, interchange code)
+        self.interchange_cache: Dict[str, Tuple[str, str]] = {}
+        self.part_cache: Dict[str, PartMappingResult] = {}
+        self._current_cache: Dict[str, bool] = {}
+        self._active_parts: Optional[FrozenSet[str]] = None
+        self._trigram_idx: Dict[str, Set[str]] = {}
+        # Active part numbers in sorted order, for prefix searches by bisection
+        self._sorted_parts: Tuple[str, ...] = ()
+        self._local = threading.local()
         self._load_interchange_mappings()
+        self._load_active_parts()
+
+    @contextmanager
+    def _lookup_cursor(self) -> Iterator[Any]:
+        """
+        Borrow a pooled connection and a lookup cursor on it for one query.
+
+        Lookups run on web worker threads, so they go through the FileMaker
+        connection pool rather than sharing the primary connection. Each
+        thread keeps its cursor while the pool hands it the same connection
+        back, and drops it after a failed query so the next one starts fresh.
+        """
+        with self.filemaker._pooled_connection() as connection:
+            if getattr(self._local, "connection", None) is not connection:
+                self._local.cursor = connection.cursor()
+                self._local.connection = connection
+            try:
+                yield self._local.cursor
+            except Exception:
+                self._local.cursor = None
+                self._local.connection = None
+                raise
 
     def _load_interchange_mappings(self) -> None:
         """Load interchange mappings from database and cache them."""
@@ -52,23 +193,23 @@ class PartMappingService:
                     ORDER BY "i"."IPTNO", "i"."ICPCD" \
                     '''
 
+            cursor.arraysize = INTERCHANGE_FETCH_SIZE
             cursor.execute(query)
-            rows = cursor.fetchall()
-
-            for row in rows:
-                if row[1] and row[2]:  # ICPNO and IPTNO not null
-                    old_number = str(row[1]).strip().upper()
-                    new_number = str(row[2]).strip().upper()
-                    code = str(row[0]).strip() if row[0] else ""
-
-                    # Create mapping
-                    mapping = InterchangeMapping(
-                        old_part_number=old_number,
-                        new_part_number=new_number,
-                        interchange_code=code
-                    )
 
-                    self.interchange_cache[old_number] = mapping
+            # Stream rows in batches rather than materializing the whole table
+            cache = self.interchange_cache
+            intern = sys.intern
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+
+                for row in rows:
+                    if row[1] and row[2]:  # ICPNO and IPTNO not null
+                        cache[intern(str(row[1]).strip().upper())] = (
+                            intern(str(row[2]).strip().upper()),
+                            str(row[0]).strip() if row[0] else ""
+                        )
 
             cursor.close()
             logger.info(f"Loaded {len(self.interchange_cache)} interchange mappings")
@@ -76,6 +217,39 @@ class PartMappingService:
         except Exception as e:
             logger.error(f"Error loading interchange mappings: {e}")
 
+    def _load_active_parts(self) -> None:
+        """Load the set of active master part numbers for in-memory lookups."""
+        try:
+            if not self.filemaker.connection:
+                logger.warning("No database connection - active parts will be checked per query")
+                return
+
+            cursor = self.filemaker.connection.cursor()
+            query = '''
+                    SELECT AS400_NumberStripped
+                    FROM Master
+                    WHERE ToggleActive = 'Yes' \
+                    '''
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
+
+            self._active_parts = frozenset(
+                str(row[0]).strip().upper() for row in rows if row[0]
+            )
+
+            trigram_idx = defaultdict(set)
+            for part in self._active_parts:
+                for trigram in _trigrams(part):
+                    trigram_idx[trigram].add(part)
+            self._trigram_idx = dict(trigram_idx)
+            self._sorted_parts = tuple(sorted(self._active_parts))
+
+            logger.info(f"Loaded {len(self._active_parts)} active part numbers")
+
+        except Exception as e:
+            logger.error(f"Error loading active part numbers: {e}")
+
     @handle_processing_errors("part_mapping")
     def map_filename_to_part_number(self, filename: str) -> PartMappingResult:
         """
@@ -87,6 +261,21 @@ class PartMappingService:
         Returns:
             PartMappingResult with mapping information
         """
+        # Mapping depends only on the stem, so repeat scans and other
+        # extensions of the same image reuse the earlier result
+        stem = Path(filename).stem.upper()
+        cached = self.part_cache.get(stem)
+        if cached is not None:
+            return cached.copy(update={"original_filename": filename})
+
+        result = self._map_filename(filename)
+        # Without a connection every lookup misses, so don't pin that answer
+        if result.mapping_method != "error" and self.filemaker.connection:
+            _cache_put(self.part_cache, stem, result)
+        return result
+
+    def _map_filename(self, filename: str) -> PartMappingResult:
+        """Map a filename to a part number without consulting the result cache."""
         try:
             # Extract potential part numbers from filename
             extracted_numbers = self._extract_part_numbers_from_filename(filename)
@@ -148,35 +337,38 @@ class PartMappingService:
         - "crown_12345_v2.jpg" -> "12345"
         """
         # Remove file extension
-        name_without_ext = Path(filename).stem
-
-        # Common patterns to try
-        patterns = [
-            # Standard Crown part numbers (letters + numbers)
-            r'^([A-Z]{0,2}\d{4,8})',
-            # Remove trailing _number or (number)
-            r'^(.+?)_\d+$',
-            r'^(.+?)\s*\(\d+\)$',
-            # Remove common suffixes
-            r'^(.+?)(?:_detail|_main|_front|_back|_top|_bottom)$',
-            # Extract part-like sequences
-            r'([A-Z]{0,2}\d{4,8})',
-            # Any sequence of letters and numbers
-            r'^([A-Z0-9]{4,12})',
-        ]
+        name = Path(filename).stem.upper()
+
+        # The common plain names need no pattern scans at all
+        part_number = _simple_part_number(name)
+        if part_number:
+            return [part_number]
+
+        sequences = PART_SEQUENCE_PATTERN.findall(name)
+
+        # Candidates in priority order: standard part number at the start,
+        # stem without copy/view suffix, part-like sequences, leading run
+        candidates = []
+        if sequences and name.startswith(sequences[0]):
+            candidates.append(sequences[0])
+        candidates.extend(STEM_PATTERN.findall(name))
+        candidates.extend(sequences)
+        leading = LEADING_ALPHANUMERIC_PATTERN.match(name)
+        if leading:
+            candidates.append(leading.group())
 
         extracted = []
+        seen = set()
 
-        for pattern in patterns:
-            matches = re.findall(pattern, name_without_ext.upper())
-            for match in matches:
-                clean_match = match.strip()
-                if len(clean_match) >= 4 and clean_match not in extracted:
-                    extracted.append(clean_match)
+        for candidate in candidates:
+            clean_match = candidate.strip()
+            if len(clean_match) >= 4 and clean_match not in seen:
+                seen.add(clean_match)
+                extracted.append(clean_match)
 
         # If no pattern matches, try the whole filename cleaned up
         if not extracted:
-            clean_name = re.sub(r'[^A-Z0-9]', '', name_without_ext.upper())
+            clean_name = NON_ALPHANUMERIC_PATTERN.sub('', name)
             if len(clean_name) >= 4:
                 extracted.append(clean_name)
 
@@ -196,8 +388,8 @@ class PartMappingService:
                 }
 
             # Check interchange mappings
-            if part_number in self.interchange_cache:
-                mapping = self.interchange_cache[part_number]
+            mapping = self.get_interchange_mapping(part_number)
+            if mapping:
                 return {
                     "part_number": mapping.new_part_number,
                     "confidence": 0.85,
@@ -212,72 +404,216 @@ class PartMappingService:
 
         return best_match
 
+    def get_interchange_mapping(self, old_part_number: str) -> Optional[InterchangeMapping]:
+        """Return the interchange mapping for an old part number, if any."""
+        entry = self.interchange_cache.get(old_part_number)
+        if entry is None:
+            return None
+
+        new_number, code = entry
+        return InterchangeMapping(
+            old_part_number=old_part_number,
+            new_part_number=new_number,
+            interchange_code=code
+        )
+
     def _is_current_part_number(self, part_number: str) -> bool:
         """Check if part number exists in current master database."""
+        if self._active_parts is not None:
+            return part_number in self._active_parts
+
+        cached = self._current_cache.get(part_number)
+        if cached is not None:
+            return cached
+
         try:
             if not self.filemaker.connection:
                 return False
 
-            cursor = self.filemaker.connection.cursor()
             query = '''
                     SELECT COUNT(*)
                     FROM Master
                     WHERE AS400_NumberStripped = ?
                       AND ToggleActive = 'Yes' \
                     '''
-            cursor.execute(query, (part_number,))
-            result = cursor.fetchone()
-            cursor.close()
+            with self._lookup_cursor() as cursor:
+                cursor.execute(query, (part_number,))
+                result = cursor.fetchone()
 
-            return result and result[0] > 0
+            is_current = bool(result and result[0] > 0)
+            _cache_put(self._current_cache, part_number, is_current)
+            return is_current
 
         except Exception as e:
             logger.error(f"Error checking current part number {part_number}: {e}")
             return False
 
+    def bulk_check_current(self, parts: List[str]) -> Set[str]:
+        """
+        Check many part numbers against the master database at once.
+
+        Issues one IN (...) query per BULK_CHECK_BATCH_SIZE parts instead of a
+        query per part, and records every answer for _is_current_part_number.
+
+        Args:
+            parts: Candidate part numbers
+
+        Returns:
+            The subset of parts that are current and active
+        """
+        if self._active_parts is not None:
+            return self._active_parts.intersection(parts)
+
+        unchecked = [part for part in dict.fromkeys(parts) if part not in self._current_cache]
+        found: Set[str] = set()
+
+        if unchecked and self.filemaker.connection:
+            try:
+                with self._lookup_cursor() as cursor:
+                    for start in range(0, len(unchecked), BULK_CHECK_BATCH_SIZE):
+                        batch = unchecked[start:start + BULK_CHECK_BATCH_SIZE]
+                        placeholders = ", ".join("?" * len(batch))
+                        query = f'''
+                                SELECT AS400_NumberStripped
+                                FROM Master
+                                WHERE AS400_NumberStripped IN ({placeholders})
+                                  AND ToggleActive = 'Yes' \
+                                '''
+                        cursor.execute(query, batch)
+                        found.update(row[0] for row in cursor.fetchall() if row[0])
+
+                for part in unchecked:
+                    _cache_put(self._current_cache, part, part in found)
+
+            except Exception as e:
+                logger.error(f"Error bulk checking {len(unchecked)} part numbers: {e}")
+
+        return {part for part in parts if part in found or self._current_cache.get(part)}
+
+    def prefetch_current_parts(self, filenames: Iterable[str]) -> None:
+        """
+        Resolve the part number candidates of many filenames in bulk.
+
+        Call before mapping a batch of files so each mapping finds its direct
+        match answers already cached instead of querying per candidate.
+        """
+        if self._active_parts is not None:
+            return  # Every lookup is already answered in memory
+
+        candidates = []
+        for filename in filenames:
+            if Path(filename).stem.upper() not in self.part_cache:
+                candidates.extend(self._extract_part_numbers_from_filename(filename))
+
+        if candidates:
+            self.bulk_check_current(candidates)
+
     def _find_fuzzy_match(self, part_number: str) -> Optional[Dict]:
         """Find fuzzy matches for part numbers."""
+        # Try variations: with/without leading zeros, letter prefixes
+        variations = [
+            part_number,
+            part_number.lstrip('0'),
+            part_number.zfill(8),
+            f"J{part_number}",
+            f"A{part_number}",
+        ]
+
+        if self._active_parts is not None:
+            return self._find_indexed_fuzzy_match(part_number, variations)
+
         try:
             if not self.filemaker.connection:
                 return None
 
-            cursor = self.filemaker.connection.cursor()
+            with self._lookup_cursor() as cursor:
+                for variation in variations:
+                    if variation != part_number:  # Don't re-check exact match
+                        query = '''
+                                SELECT AS400_NumberStripped
+                                FROM Master
+                                WHERE AS400_NumberStripped LIKE ?
+                                  AND ToggleActive = 'Yes' LIMIT 1 \
+                                '''
+                        cursor.execute(query, (f"%{variation}%",))
+                        result = cursor.fetchone()
+
+                        if result:
+                            return {
+                                "part_number": result[0],
+                                "confidence": 0.6,
+                                "method": "fuzzy_match"
+                            }
 
-            # Try variations: with/without leading zeros, letter prefixes
-            variations = [
-                part_number,
-                part_number.lstrip('0'),
-                part_number.zfill(8),
-                f"J{part_number}",
-                f"A{part_number}",
-            ]
-
-            for variation in variations:
-                if variation != part_number:  # Don't re-check exact match
-                    query = '''
-                            SELECT AS400_NumberStripped
-                            FROM Master
-                            WHERE AS400_NumberStripped LIKE ?
-                              AND ToggleActive = 'Yes' LIMIT 1 \
-                            '''
-                    cursor.execute(query, (f"%{variation}%",))
-                    result = cursor.fetchone()
-
-                    if result:
-                        cursor.close()
-                        return {
-                            "part_number": result[0],
-                            "confidence": 0.6,
-                            "method": "fuzzy_match"
-                        }
-
-            cursor.close()
             return None
 
         except Exception as e:
             logger.error(f"Error in fuzzy matching for {part_number}: {e}")
             return None
 
+    def _find_indexed_fuzzy_match(self, part_number: str, variations: List[str]) -> Optional[Dict]:
+        """Find the active part containing a variation, using the trigram index."""
+        for variation in variations:
+            if variation == part_number or not variation:
+                continue
+
+            trigrams = _trigrams(variation)
+            if trigrams:
+                candidates = set.intersection(
+                    *(self._trigram_idx.get(trigram, set()) for trigram in trigrams)
+                )
+            else:
+                candidates = self._active_parts  # Too short to index
+
+            # Sharing trigrams doesn't guarantee the substring itself
+            matches = [candidate for candidate in candidates if variation in candidate]
+            if matches:
+                # Every match contains the variation, so its edit distance
+                # is the length difference; prefer the closest
+                best = min(matches, key=lambda candidate: (len(candidate), candidate))
+                return {
+                    "part_number": best,
+                    "confidence": 0.6,
+                    "method": "fuzzy_match"
+                }
+
+        return self._find_similar_part(part_number)
+
+    def _find_similar_part(self, part_number: str) -> Optional[Dict]:
+        """Find the closest active part by edit distance, e.g. for typos."""
+        # Only parts sharing a trigram can be similar enough to matter
+        candidates = set().union(
+            *(self._trigram_idx.get(trigram, ()) for trigram in _trigrams(part_number))
+        )
+        if not candidates:
+            return None
+
+        if fuzz_process is not None:
+            match = fuzz_process.extractOne(
+                part_number,
+                sorted(candidates),
+                scorer=Levenshtein.normalized_similarity,
+                score_cutoff=SIMILARITY_CUTOFF
+            )
+        else:
+            # Pure-Python fallback: Sift3 is far cheaper than Levenshtein and
+            # close enough for ranking short part numbers
+            match = None
+            for candidate in sorted(candidates):
+                score = 1 - _sift3(part_number, candidate) / max(len(part_number), len(candidate))
+                if score >= SIMILARITY_CUTOFF and (match is None or score > match[1]):
+                    match = (candidate, score, None)
+
+        if not match:
+            return None
+
+        best, score, _ = match
+        return {
+            "part_number": best,
+            "confidence": round(0.6 * score, 2),
+            "method": "similarity_match"
+        }
+
     def get_manual_override_suggestions(self, filename: str, user_input: str) -> List[str]:
         """
         Get suggestions for manual part number override.
@@ -290,10 +626,23 @@ class PartMappingService:
             List of suggested part numbers
         """
         try:
-            if not self.filemaker.connection or len(user_input) < 2:
+            if len(user_input) < 2:
+                return []
+
+            if self._sorted_parts:
+                # Parts sharing the prefix sit together in sorted order
+                prefix = user_input.upper()
+                start = bisect.bisect_left(self._sorted_parts, prefix)
+                suggestions = []
+                for part in self._sorted_parts[start:start + MAX_OVERRIDE_SUGGESTIONS]:
+                    if not part.startswith(prefix):
+                        break
+                    suggestions.append(part)
+                return suggestions
+
+            if not self.filemaker.connection:
                 return []
 
-            cursor = self.filemaker.connection.cursor()
             query = '''
                     SELECT DISTINCT AS400_NumberStripped
                     FROM Master
@@ -301,9 +650,9 @@ class PartMappingService:
                       AND ToggleActive = 'Yes'
                     ORDER BY AS400_NumberStripped LIMIT 10 \
                     '''
-            cursor.execute(query, (f"{user_input.upper()}%",))
-            results = cursor.fetchall()
-            cursor.close()
+            with self._lookup_cursor() as cursor:
+                cursor.execute(query, (f"{user_input.upper()}%",))
+                results = cursor.fetchall()
 
             return [row[0] for row in results if row[0]]
 
@@ -315,7 +664,18 @@ class PartMappingService:
         """Validate that a part number exists and is active."""
         return self._is_current_part_number(part_number.upper().strip())
 
+    def refresh_active_parts(self) -> None:
+        """Reload the active part number set from database."""
+        self._active_parts = None
+        self._trigram_idx = {}
+        self._sorted_parts = ()
+        self.part_cache.clear()
+        self._current_cache.clear()
+        self._load_active_parts()
+
     def refresh_interchange_cache(self) -> None:
         """Refresh the interchange mapping cache from database."""
         self.interchange_cache.clear()
+        self.part_cache.clear()
+        self._current_cache.clear()
         self._load_interchange_mappings()
\ No newline at end of file
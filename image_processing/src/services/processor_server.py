@@ -4,14 +4,19 @@ Image Processor Server - Clean Architecture Implementation
 Provides REST API for PSD processing and production format generation
 """
 
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 import uvicorn
 import httpx
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from ..config.settings import settings
@@ -21,25 +26,66 @@ from ..models.processing_models import FormatGenerationRequest
 from ..models.metadata_models import ExifMetadata
 from ..models.file_models import ProcessedFile, FileMetadata, FileType, FileStatus
 from ..utils.logging_config import setup_logging
+from ..utils.time_utils import coarse_now_iso
 
 # Setup logging
 setup_logging(settings.log_level)
 logger = logging.getLogger(__name__)
 
-# FastAPI app
-app = FastAPI(
-    title="Crown Automotive Image Processor",
-    description="PSD processing and production format generation",
-    version="1.0.0"
-)
-
 # Global services
 image_processor: Optional[ImageProcessingService] = None
 filemaker: Optional[FileMakerService] = None
+monitor_client: Optional[httpx.AsyncClient] = None
+
+# Output specs don't change after startup, so /formats is serialized once
+formats_payload: Optional[bytes] = None
 
 # File monitor service URL
 FILE_MONITOR_URL = "http://file_monitor:8002"
 
+# Reuse dependency probe results briefly so rapid liveness checks don't hit FileMaker each time
+HEALTH_CACHE_SECONDS = 2.0
+_health_cache: Dict[str, Any] = {"expires_at": 0.0, "file_monitor_api": False, "filemaker": False}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup and release them on shutdown."""
+    global image_processor, filemaker, monitor_client
+
+    try:
+        logger.info("Initializing image processor services...")
+        # Both constructors block on I/O (spec files, database login); build them side by side
+        image_processor, filemaker = await asyncio.gather(
+            asyncio.to_thread(ImageProcessingService),
+            asyncio.to_thread(FileMakerService)
+        )
+
+        # One pooled client keeps connections to the file monitor alive between calls
+        monitor_client = httpx.AsyncClient(
+            base_url=FILE_MONITOR_URL,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+        logger.info("Image processor services initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize services: {e}")
+        raise
+
+    yield
+
+    await monitor_client.aclose()
+
+
+# FastAPI app
+app = FastAPI(
+    title="Crown Automotive Image Processor",
+    description="PSD processing and production format generation",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
 
 class ProcessingRequestAPI(BaseModel):
     """API request model for processing operations."""
@@ -53,38 +99,37 @@ class ProcessingRequestAPI(BaseModel):
 async def get_file_from_monitor(file_id: str) -> Optional[ProcessedFile]:
     """Get file data from file monitor service via API."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{FILE_MONITOR_URL}/files/{file_id}")
-
-            if response.status_code == 404:
-                return None
-            elif response.status_code != 200:
-                logger.error(f"File monitor API error: {response.status_code}")
-                return None
-
-            file_data = response.json()
-
-            # Convert API response back to ProcessedFile object
-            metadata = FileMetadata(
-                file_id=file_data["file_id"],
-                original_path=Path(file_data["current_location"]),
-                filename=file_data["filename"],
-                file_type=FileType(file_data["file_type"]),
-                size_bytes=int(file_data["size_mb"] * 1024 * 1024),  # Convert back to bytes
-                checksum_md5="",  # Not needed for processing
-                checksum_sha256=file_data["checksum"],
-                modified_at=datetime.now(),
-                status=FileStatus(file_data["status"])
-            )
+        response = await monitor_client.get(f"/files/{file_id}")
+
+        if response.status_code == 404:
+            return None
+        elif response.status_code != 200:
+            logger.error(f"File monitor API error: {response.status_code}")
+            return None
+
+        file_data = response.json()
+
+        # Convert API response back to ProcessedFile object
+        metadata = FileMetadata(
+            file_id=file_data["file_id"],
+            original_path=Path(file_data["current_location"]),
+            filename=file_data["filename"],
+            file_type=FileType(file_data["file_type"]),
+            size_bytes=int(file_data["size_mb"] * 1024 * 1024),  # Convert back to bytes
+            checksum_md5="",  # Not needed for processing
+            checksum_sha256=file_data["checksum"],
+            modified_at=datetime.now(),
+            status=FileStatus(file_data["status"])
+        )
 
-            processed_file = ProcessedFile(
-                metadata=metadata,
-                current_location=Path(file_data["current_location"]),
-                part_number=file_data.get("part_number"),
-                processing_history=file_data.get("processing_history", [])
-            )
+        processed_file = ProcessedFile(
+            metadata=metadata,
+            current_location=Path(file_data["current_location"]),
+            part_number=file_data.get("part_number"),
+            processing_history=file_data.get("processing_history", [])
+        )
 
-            return processed_file
+        return processed_file
 
     except Exception as e:
         logger.error(f"Error getting file from monitor: {e}")
@@ -94,55 +139,60 @@ async def get_file_from_monitor(file_id: str) -> Optional[ProcessedFile]:
 async def update_file_status(file_id: str, status: str, reason: str = None) -> bool:
     """Update file status via file monitor API."""
     try:
-        async with httpx.AsyncClient() as client:
-            data = {"status": status}
-            if reason:
-                data["reason"] = reason
+        data = {"status": status}
+        if reason:
+            data["reason"] = reason
 
-            response = await client.put(f"{FILE_MONITOR_URL}/files/{file_id}/status",
-                                        params=data)
+        response = await monitor_client.put(f"/files/{file_id}/status", json=data)
 
-            return response.status_code == 200
+        return response.status_code == 200
 
     except Exception as e:
         logger.error(f"Error updating file status: {e}")
         return False
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    global image_processor, filemaker
+async def _check_file_monitor() -> bool:
+    """Probe the file monitor health endpoint."""
+    try:
+        response = await monitor_client.get("/health")
+        return response.status_code == 200
+    except Exception:
+        return False
+
 
+async def _check_filemaker() -> bool:
+    """Test the FileMaker connection without blocking the event loop."""
+    if not filemaker:
+        return False
     try:
-        logger.info("Initializing image processor services...")
-        image_processor = ImageProcessingService()
-        filemaker = FileMakerService()
-        logger.info("Image processor services initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize services: {e}")
-        raise
+        return await asyncio.to_thread(filemaker.test_connection)
+    except Exception:
+        return False
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    # Test connection to file monitor
-    file_monitor_healthy = False
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{FILE_MONITOR_URL}/health", timeout=5.0)
-            file_monitor_healthy = response.status_code == 200
-    except:
-        pass
+    # Probe both dependencies concurrently, at most once per cache window
+    now = time.monotonic()
+    if now >= _health_cache["expires_at"]:
+        file_monitor_healthy, filemaker_healthy = await asyncio.gather(
+            _check_file_monitor(), _check_filemaker()
+        )
+        _health_cache.update(
+            expires_at=now + HEALTH_CACHE_SECONDS,
+            file_monitor_api=file_monitor_healthy,
+            filemaker=filemaker_healthy
+        )
 
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": coarse_now_iso(),
         "services": {
             "image_processor": image_processor is not None,
-            "file_monitor_api": file_monitor_healthy,
-            "filemaker": filemaker is not None and filemaker.test_connection() if filemaker else False
+            "file_monitor_api": _health_cache["file_monitor_api"],
+            "filemaker": _health_cache["filemaker"]
         }
     }
 
@@ -183,8 +233,11 @@ async def process_image(request: ProcessingRequestAPI) -> Dict[str, Any]:
         # Update status to processing
         await update_file_status(request.file_id, "processing")
 
-        # Process formats
-        result = image_processor.generate_formats(file_obj, format_request, exif_metadata)
+        # Process formats in a worker thread; PIL and exiftool release the GIL,
+        # so other requests keep being served meanwhile
+        result = await asyncio.to_thread(
+            image_processor.generate_formats, file_obj, format_request, exif_metadata
+        )
 
         # Update status based on result
         if result.success:
@@ -221,28 +274,38 @@ async def process_image(request: ProcessingRequestAPI) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _build_formats_payload() -> bytes:
+    """Serialize the available output formats to JSON."""
+    formats = []
+    for spec in image_processor.output_specs:
+        formats.append({
+            "name": spec["name"],
+            "format": spec["format"],
+            "dpi": spec["dpi"],
+            "dimensions": spec.get("resize") or spec.get("extent"),
+            "has_watermark": bool(spec.get("watermark")),
+            "has_brand_icon": bool(spec.get("brand_icon"))
+        })
+
+    return orjson.dumps({
+        "total_formats": len(formats),
+        "formats": formats
+    })
+
+
 @app.get("/formats")
 async def list_output_formats():
     """List available output formats."""
+    global formats_payload
+
     try:
         if not image_processor:
             raise HTTPException(status_code=503, detail="Image processor not initialized")
 
-        formats = []
-        for spec in image_processor.output_specs:
-            formats.append({
-                "name": spec["name"],
-                "format": spec["format"],
-                "dpi": spec["dpi"],
-                "dimensions": spec.get("resize") or spec.get("extent"),
-                "has_watermark": bool(spec.get("watermark")),
-                "has_brand_icon": bool(spec.get("brand_icon"))
-            })
+        if formats_payload is None:
+            formats_payload = _build_formats_payload()
 
-        return {
-            "total_formats": len(formats),
-            "formats": formats
-        }
+        return Response(content=formats_payload, media_type="application/json")
 
     except Exception as e:
         logger.error(f"List formats error: {e}")
@@ -261,7 +324,7 @@ async def get_status():
             "formats_available": len(image_processor.output_specs),
             "database_connected": filemaker.test_connection() if filemaker else False,
             "file_monitor_url": FILE_MONITOR_URL,
-            "last_check": datetime.now().isoformat()
+            "last_check": coarse_now_iso()
         }
 
     except Exception as e:
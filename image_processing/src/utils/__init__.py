@@ -1,24 +1,35 @@
 # ===== src/utils/__init__.py =====
 """Utility modules for the Crown Automotive Image Processing System."""
 
-from .crypto_utils import calculate_file_checksums, generate_file_id
+from .crypto_utils import (
+    calculate_file_checksums, calculate_file_checksums_batch, generate_file_id, get_hash_backend_info
+)
 from .filesystem_utils import (
-    is_file_stable, detect_file_type, is_valid_image_file, ensure_directory
+    FileStabilityTracker, is_file_stable, detect_file_type, is_candidate_image_name,
+    is_valid_image_file, scan_image_candidates, ensure_directory
 )
+from .image_utils import get_thumbnail
 from .error_handling import (
     ProcessingError, FileNotFoundError, InvalidFileError,
     ProcessingTimeoutError, handle_processing_errors
 )
 from .logging_config import setup_logging
+from .time_utils import coarse_now_iso
 
 __all__ = [
     # Crypto utilities
-    'calculate_file_checksums', 'generate_file_id',
+    'calculate_file_checksums', 'calculate_file_checksums_batch', 'generate_file_id',
+    'get_hash_backend_info',
     # Filesystem utilities
-    'is_file_stable', 'detect_file_type', 'is_valid_image_file', 'ensure_directory',
+    'FileStabilityTracker', 'is_file_stable', 'detect_file_type', 'is_candidate_image_name',
+    'is_valid_image_file', 'scan_image_candidates', 'ensure_directory',
+    # Image utilities
+    'get_thumbnail',
     # Error handling
     'ProcessingError', 'FileNotFoundError', 'InvalidFileError',
     'ProcessingTimeoutError', 'handle_processing_errors',
     # Logging
-    'setup_logging'
+    'setup_logging',
+    # Time
+    'coarse_now_iso'
 ]
\ No newline at end of file
@@ -1,6 +1,5 @@
 # ===== src/utils/error_handling.py =====
 import logging
-import traceback
 from functools import wraps
 from typing import Any, Callable, Optional, Type, Union
 from ..models.processing_models import ProcessingResult
@@ -60,8 +59,7 @@ def handle_processing_errors(
                     )
                 raise
             except Exception as e:
-                logger.error(f"Unexpected error in {operation_name}: {e}")
-                logger.error(traceback.format_exc())
+                logger.exception(f"Unexpected error in {operation_name}: {e}")
                 if return_type == ProcessingResult:
                     return ProcessingResult(
                         file_id=kwargs.get('file_id', 'unknown'),
@@ -1,9 +1,21 @@
 # ===== src/utils/filesystem_utils.py =====
+import os
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from ..models.file_models import FileType
 
+# Supported image extensions (lower case)
+FILE_TYPES_BY_EXTENSION = {
+    '.psd': FileType.PSD,
+    '.png': FileType.PNG,
+    '.jpg': FileType.JPEG,
+    '.jpeg': FileType.JPEG,
+    '.tif': FileType.TIFF,
+    '.tiff': FileType.TIFF,
+    '.bmp': FileType.BMP,
+}
+
 
 def is_file_stable(file_path: Path, wait_seconds: int = 2) -> bool:
     """
@@ -24,6 +36,60 @@ def is_file_stable(file_path: Path, wait_seconds: int = 2) -> bool:
         return False
 
 
+class FileStabilityTracker:
+    """
+    Non-blocking replacement for is_file_stable across repeated scans.
+
+    Instead of sleeping, remember each file's size and modification time and
+    call it stable once they have stayed the same for settle_seconds between
+    scans. Files last modified longer than at_rest_seconds ago are stable
+    straight away, so files already at rest don't wait for a second scan.
+    """
+
+    def __init__(self, settle_seconds: float = 2.0, at_rest_seconds: float = 60.0):
+        self.settle_seconds = settle_seconds
+        self.at_rest_seconds = at_rest_seconds
+        self._observations: Dict[Path, Tuple[int, int, float]] = {}
+
+    def is_stable(self, file_path: Path, file_stat: os.stat_result) -> bool:
+        """
+        Check whether a file has stopped changing, without blocking.
+
+        Args:
+            file_path: Path of the file
+            file_stat: Current stat result for the file
+
+        Returns:
+            True if the file is stable; False means check again on a later scan
+        """
+        if time.time() - file_stat.st_mtime >= self.at_rest_seconds:
+            self._observations.pop(file_path, None)
+            return True
+
+        now = time.monotonic()
+        signature = (file_stat.st_size, file_stat.st_mtime_ns)
+        observed = self._observations.get(file_path)
+
+        if observed is None or observed[:2] != signature:
+            self._observations[file_path] = (*signature, now)
+            return False
+
+        if now - observed[2] < self.settle_seconds:
+            return False
+
+        del self._observations[file_path]
+        return True
+
+    def retain(self, file_paths: Set[Path]) -> None:
+        """Forget observations for files no longer present."""
+        for gone_path in self._observations.keys() - file_paths:
+            del self._observations[gone_path]
+
+    def clear(self) -> None:
+        """Forget all observations."""
+        self._observations.clear()
+
+
 def detect_file_type(file_path: Path) -> Optional[FileType]:
     """
     Detect file type from extension.
@@ -34,51 +100,93 @@ def detect_file_type(file_path: Path) -> Optional[FileType]:
     Returns:
         Detected FileType or None
     """
-    extension = file_path.suffix.lower()
+    return FILE_TYPES_BY_EXTENSION.get(file_path.suffix.lower())
 
-    type_mapping = {
-        '.psd': FileType.PSD,
-        '.png': FileType.PNG,
-        '.jpg': FileType.JPEG,
-        '.jpeg': FileType.JPEG,
-        '.tif': FileType.TIFF,
-        '.tiff': FileType.TIFF,
-        '.bmp': FileType.BMP,
-    }
 
-    return type_mapping.get(extension)
+def is_candidate_image_name(file_path: Path) -> bool:
+    """
+    Check the name-only criteria for a processable image.
 
+    Args:
+        file_path: Path to check
 
-def is_valid_image_file(file_path: Path, min_size_bytes: int = 1024) -> bool:
+    Returns:
+        True if the extension is supported and the file is not a
+        processed output or hidden file
+    """
+    # Check if it's a supported type
+    if not detect_file_type(file_path):
+        return False
+
+    # Skip processed files to prevent loops
+    name = file_path.name
+    return '_bg_removed' not in name and not name.startswith('.')
+
+
+def scan_image_candidates(directory: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+    """
+    Yield candidate image files in a directory with their stat results.
+
+    os.scandir returns names and file types with the directory listing, so
+    names are filtered before anything is stat'ed and only candidate images
+    cost a stat call (none at all on Windows, where DirEntry caches it).
+
+    Args:
+        directory: Directory to scan (not recursive)
+
+    Yields:
+        (path, stat result) for each regular file passing is_candidate_image_name
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            file_path = Path(entry.path)
+            if not is_candidate_image_name(file_path):
+                continue
+            try:
+                if entry.is_file():
+                    yield file_path, entry.stat()
+            except OSError:
+                continue  # Removed or unreadable since the listing
+
+
+def is_valid_image_file(
+        file_path: Path,
+        min_size_bytes: int = 1024,
+        file_stat: Optional[os.stat_result] = None,
+        stability_tracker: Optional[FileStabilityTracker] = None
+) -> bool:
     """
     Validate if file is a processable image.
 
     Args:
         file_path: Path to validate
         min_size_bytes: Minimum file size
+        file_stat: Stat result for a path already known to be a regular file
+            (e.g. from os.scandir); avoids re-stating the file
+        stability_tracker: Check stability against earlier scans instead of
+            sleeping in is_file_stable
 
     Returns:
         True if valid
     """
-    if not file_path.is_file():
+    if file_stat is None and not file_path.is_file():
         return False
 
-    # Check if it's a supported type
-    if not detect_file_type(file_path):
-        return False
-
-    # Skip processed files to prevent loops
-    if '_bg_removed' in file_path.name or file_path.name.startswith('.'):
+    if not is_candidate_image_name(file_path):
         return False
 
     # Check file size
     try:
-        if file_path.stat().st_size < min_size_bytes:
+        if file_stat is None:
+            file_stat = file_path.stat()
+        if file_stat.st_size < min_size_bytes:
             return False
     except OSError:
         return False
 
     # Check if file is stable
+    if stability_tracker is not None:
+        return stability_tracker.is_stable(file_path, file_stat)
     return is_file_stable(file_path)
 
 
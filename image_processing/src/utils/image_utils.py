@@ -0,0 +1,63 @@
+# ===== src/utils/image_utils.py =====
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from .filesystem_utils import ensure_directory
+
+logger = logging.getLogger(__name__)
+
+# Longest edge of preview thumbnails, in pixels; enough for the review panels
+THUMBNAIL_MAX_SIZE = 1024
+
+
+def get_thumbnail(
+        source_path: Path,
+        cache_dir: Path,
+        name: str,
+        max_size: int = THUMBNAIL_MAX_SIZE
+) -> Optional[Path]:
+    """
+    Get a small WebP thumbnail of an image, generating it on first use.
+
+    Thumbnails are cached in cache_dir under the given name, size and the
+    source's modification time, so a changed source gets a fresh thumbnail.
+
+    Args:
+        source_path: Image to make a thumbnail of
+        cache_dir: Directory holding generated thumbnails
+        name: Cache name for the image, e.g. its file ID
+        max_size: Longest edge of the thumbnail in pixels
+
+    Returns:
+        Path to the thumbnail, or None if the image couldn't be read
+    """
+    try:
+        source_stat = source_path.stat()
+        thumbnail_path = cache_dir / f"{name}_{max_size}_{source_stat.st_mtime_ns}.webp"
+        if thumbnail_path.exists():
+            return thumbnail_path
+
+        ensure_directory(cache_dir)
+        with Image.open(source_path) as img:
+            # draft() lets JPEG decode at a reduced scale instead of full size
+            img.draft("RGB", (max_size, max_size))
+            img.thumbnail((max_size, max_size))
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+            # Write under a temporary name so concurrent requests never serve a partial file
+            partial_path = thumbnail_path.with_name(f".{thumbnail_path.name}.{uuid.uuid4().hex}.part")
+            img.save(partial_path, format="WEBP", quality=80, method=4)
+        os.replace(partial_path, thumbnail_path)
+
+        logger.debug(f"Created thumbnail for {source_path.name}")
+        return thumbnail_path
+
+    except Exception as e:
+        logger.warning(f"Could not create thumbnail for {source_path}: {e}")
+        return None
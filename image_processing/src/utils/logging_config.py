@@ -2,9 +2,18 @@
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 import structlog
-from structlog.stdlib import filter_by_level
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSONRenderer serializer using orjson; the stdlib logger expects str."""
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
 
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> None:
@@ -15,22 +24,31 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> N
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional file to write logs to
     """
-    # Configure structlog
+    level = getattr(logging, log_level.upper())
+
+    processors = [
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+    # Stack rendering only matters while debugging
+    if level <= logging.DEBUG:
+        processors.append(structlog.processors.StackInfoRenderer())
+    processors += [
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps) if orjson
+        else structlog.processors.JSONRenderer(),
+    ]
+
+    # Configure structlog; the filtering wrapper drops calls below the
+    # level before any processor runs
     structlog.configure(
-        processors=[
-            filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
-        ],
+        processors=processors,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         cache_logger_on_first_use=True,
     )
 
@@ -38,7 +56,7 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> N
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, log_level.upper())
+        level=level
     )
 
     # Add file handler if specified
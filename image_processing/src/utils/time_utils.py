@@ -0,0 +1,26 @@
+# ===== src/utils/time_utils.py =====
+import time
+from datetime import datetime
+
+_cached_second = -1
+_cached_iso = ""
+
+
+def coarse_now_iso() -> str:
+    """
+    Get the current local time as an ISO 8601 string at one-second resolution.
+
+    The formatted string is reused for every call within the same second, so
+    request handlers don't build and format a datetime per response. Use
+    datetime.now() where sub-second precision matters (e.g. processing history).
+
+    Returns:
+        ISO 8601 timestamp without microseconds
+    """
+    global _cached_second, _cached_iso
+
+    second = int(time.time())
+    if second != _cached_second:
+        _cached_iso = datetime.fromtimestamp(second).isoformat()
+        _cached_second = second
+    return _cached_iso
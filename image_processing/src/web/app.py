@@ -1,20 +1,32 @@
 # ===== src/web/app.py =====
 """
 Web Application - Clean Architecture Implementation
-Flask application with clean separation of concerns and manual override capabilities
+Quart application with clean separation of concerns and manual override capabilities
 """
 
+import asyncio
+import gzip
 import json
 import logging
 import os
+import time
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
 
 import httpx
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash
+from quart import Quart, Response, render_template, request, jsonify, send_file, redirect, url_for, flash
+from quart.json.provider import DefaultJSONProvider
+from quart.wrappers.response import DataBody, FileBody
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..config.settings import settings
 from ..services.part_mapping_service import PartMappingService
 from ..services.filemaker_service import FileMakerService
@@ -22,7 +34,9 @@ from ..services.notification_service import NotificationService
 from ..models.file_models import FileStatus
 from ..models.part_mapping_models import ManualOverride
 from ..models.metadata_models import ExifMetadata, PartMetadata
+from ..utils.image_utils import get_thumbnail
 from ..utils.logging_config import setup_logging
+from ..utils.time_utils import coarse_now_iso
 
 # Setup logging
 setup_logging(settings.log_level)
@@ -31,12 +45,73 @@ logger = logging.getLogger(__name__)
 # Service URLs
 FILE_MONITOR_URL = "http://file_monitor:8002"
 
+# Reuse the FileMaker connection probe across status polls; retry sooner after a failure
+DB_STATUS_CACHE_SECONDS = 5.0
+DB_STATUS_FAILURE_CACHE_SECONDS = 1.0
+
+# Reuse the monitor's /status answer briefly, so concurrent dashboards and polls share one request
+MONITOR_STATUS_CACHE_SECONDS = 2.0
+
+# Image types accepted by the upload form
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({'.psd', '.png', '.jpg', '.jpeg', '.tiff', '.tif'})
+ALLOWED_UPLOAD_EXTENSIONS_TEXT = ", ".join(sorted(ALLOWED_UPLOAD_EXTENSIONS))
+
+# Bytes read per chunk when streaming files such as image previews
+FILE_CHUNK_BYTES = 1 << 20
+
+# Browser cache lifetime for preview thumbnails
+THUMBNAIL_MAX_AGE_SECONDS = 86400
+
+# Responses gzipped for clients that accept it; smaller bodies aren't worth it
+COMPRESSIBLE_MIMETYPES = frozenset({'text/html', 'application/json'})
+COMPRESS_MIN_BYTES = 512
+# Added to the ETag of gzipped bodies, which differ byte-wise from identity ones
+GZIP_ETAG_SUFFIX = '-gzip'
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, so jsonify skips the stdlib encoder."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response instead of decoding and re-encoding
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class LargeChunkFileBody(FileBody):
+    """File body read in 1 MiB chunks rather than Quart's 8 KiB default."""
+
+    buffer_size = FILE_CHUNK_BYTES
+
+
+class AppResponse(Response):
+    """Response class whose send_file bodies stream in large chunks."""
 
-def create_app() -> Flask:
-    """Create and configure Flask application."""
-    app = Flask(__name__, template_folder='/app/templates')
+    file_body_class = LargeChunkFileBody
+
+
+def create_app() -> Quart:
+    """
+    Create and configure the Quart application.
+
+    Route handlers run on the event loop; blocking FileMaker and part
+    mapping calls are pushed to worker threads with asyncio.to_thread.
+    """
+    app = Quart(__name__, template_folder='/app/templates')
+    app.response_class = AppResponse
     app.config['SECRET_KEY'] = settings.web.secret_key
     app.config['MAX_CONTENT_LENGTH'] = settings.processing.max_file_size_bytes
+    server_url = f"http://{settings.web.host}:{settings.web.port}"
+    thumbnail_dir = settings.processing.metadata_dir / "thumbnails"
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     # Initialize services (gracefully handle failures)
     part_mapper = None
@@ -61,25 +136,77 @@ def create_app() -> Flask:
     except Exception as e:
         logger.warning(f"Notification service failed to initialize: {e}")
 
-    async def get_files_by_status(status: str) -> List[Dict]:
-        """Get files by status from file monitor service."""
+    db_status = {"expires_at": 0.0, "connected": False}
+    monitor_status_cache = {"expires_at": 0.0, "status": {}}
+    # Strong references to fire-and-forget tasks, so they aren't collected mid-run
+    background_tasks = set()
+    # Last rendered dashboard (and its gzipped bytes) and the monitor status version it was rendered at
+    dashboard_cache = {"version": None, "html": None, "gzip": None}
+
+    def cached_db_connected() -> bool:
+        """FileMaker connection status, probed at most once per cache window."""
+        now = time.monotonic()
+        if now >= db_status["expires_at"]:
+            connected = bool(filemaker.test_connection()) if filemaker else False
+            ttl = DB_STATUS_CACHE_SECONDS if connected else DB_STATUS_FAILURE_CACHE_SECONDS
+            db_status.update(expires_at=now + ttl, connected=connected)
+        return db_status["connected"]
+
+    async def get_files_by_status(status: str, limit: int = 10) -> Optional[List[Dict]]:
+        """Get up to `limit` files with a status from file monitor service, or None on failure."""
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(f"{FILE_MONITOR_URL}/processable")
+                response = await client.get(
+                    f"{FILE_MONITOR_URL}/files", params={'status': status, 'limit': limit}
+                )
 
                 if response.status_code != 200:
                     logger.error(f"File monitor API error: {response.status_code}")
-                    return []
-
-                data = response.json()
-                files = data.get('new_files', [])
+                    return None
 
-                # Filter by status
-                return [f for f in files if f.get('status') == status]
+                return response.json().get('files', [])
 
         except Exception as e:
             logger.error(f"Error getting files by status: {e}")
-            return []
+            return None
+
+    async def get_monitor_status() -> Dict:
+        """Get monitor status, including per-status file counts, from file monitor service."""
+        now = time.monotonic()
+        if now < monitor_status_cache["expires_at"]:
+            return monitor_status_cache["status"]
+
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"{FILE_MONITOR_URL}/status")
+
+                if response.status_code != 200:
+                    logger.error(f"File monitor API error: {response.status_code}")
+                    return {}
+
+                status = response.json()
+                monitor_status_cache.update(expires_at=now + MONITOR_STATUS_CACHE_SECONDS, status=status)
+                return status
+
+        except Exception as e:
+            logger.error(f"Error getting monitor status: {e}")
+            return {}
+
+    def status_stats(monitor_status: Dict) -> Dict[str, int]:
+        """Dashboard counts from the monitor's per-status counts."""
+        counts = monitor_status.get('status_counts', {})
+        return {
+            'pending': counts.get('awaiting_review', 0),
+            'completed': counts.get('approved', 0),
+            'processing': counts.get('processing', 0),
+            'failed': counts.get('failed', 0)
+        }
+
+    def gzip_body(data: bytes) -> Optional[bytes]:
+        """Gzip a response body, or None when it's too small to be worth it."""
+        if len(data) < COMPRESS_MIN_BYTES:
+            return None
+        return gzip.compress(data, compresslevel=6)
 
     async def get_file_by_id(file_id: str) -> Optional[Dict]:
         """Get file by ID from file monitor service."""
@@ -103,204 +230,304 @@ def create_app() -> Flask:
         """Update file status via API."""
         try:
             async with httpx.AsyncClient() as client:
-                params = {"status": status}
+                data = {"status": status}
                 if reason:
-                    params["reason"] = reason
+                    data["reason"] = reason
 
                 response = await client.put(f"{FILE_MONITOR_URL}/files/{file_id}/status",
-                                            params=params)
+                                            json=data)
 
+                # Our own change should show on the next dashboard load
+                monitor_status_cache["expires_at"] = 0.0
                 return response.status_code == 200
 
         except Exception as e:
             logger.error(f"Error updating file status: {e}")
             return False
 
+    def map_pending_files(pending_files: List[Dict]) -> List[Dict]:
+        """Build dashboard rows for pending files, with part suggestions (blocking)."""
+        pending_data = []
+        if part_mapper:
+            part_mapper.prefetch_current_parts(
+                f.get('filename', '') for f in pending_files if not f.get('part_number')
+            )
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M')  # TODO: Parse from API
+        for f in pending_files:
+            file_id = f.get('file_id')
+            file_data = {
+                'file_id': file_id,
+                'filename': f.get('filename'),
+                'size_mb': f.get('size_mb'),
+                'status': f.get('status'),
+                'created_at': created_at,
+                'preview_url': f'/api/preview/{file_id}',
+                'review_url': f'/review/{file_id}',
+                'edit_url': f'/edit/{file_id}'
+            }
+
+            # Add part mapping if available and part_mapper is ready
+            if not f.get('part_number') and part_mapper:
+                try:
+                    mapping_result = part_mapper.map_filename_to_part_number(f.get('filename', ''))
+                    if mapping_result.mapped_part_number:
+                        file_data['suggested_part'] = mapping_result.mapped_part_number
+                        file_data['mapping_confidence'] = mapping_result.confidence_score
+                        file_data['needs_review'] = mapping_result.requires_manual_review
+                except Exception as e:
+                    logger.warning(f"Part mapping failed for {f.get('filename')}: {e}")
+
+            pending_data.append(file_data)
+
+        return pending_data
+
+    def lookup_part(file_data: Dict) -> Tuple[Any, Optional[str], Optional[PartMetadata]]:
+        """Part mapping, part number and FileMaker metadata for a file (blocking)."""
+        # Get part mapping if not already done
+        part_mapping = None
+        if not file_data.get('part_number') and part_mapper:
+            try:
+                part_mapping = part_mapper.map_filename_to_part_number(file_data['filename'])
+            except Exception as e:
+                logger.warning(f"Part mapping failed: {e}")
+
+        # Get part metadata if we have a part number
+        part_metadata = None
+        part_number = file_data.get('part_number') or (part_mapping.mapped_part_number if part_mapping else None)
+        if part_number and filemaker:
+            try:
+                part_metadata = filemaker.get_part_metadata(part_number)
+            except Exception as e:
+                logger.warning(f"Failed to get part metadata: {e}")
+
+        return part_mapping, part_number, part_metadata
+
+    def suggest_parts(filename: str, query: str) -> List[Dict]:
+        """Part number suggestions with their FileMaker metadata (blocking)."""
+        suggestions = part_mapper.get_manual_override_suggestions(filename, query)[:10]  # Limit to 10
+
+        # Get additional metadata for suggestions in one query
+        metadata_by_part = {}
+        if filemaker and suggestions:
+            try:
+                metadata_by_part = filemaker.get_part_metadata_bulk(suggestions)
+            except Exception as e:
+                logger.warning(f"Failed to get metadata for suggestions: {e}")
+
+        suggestion_data = []
+        for part_number in suggestions:
+            metadata = metadata_by_part.get(part_number.upper().strip())
+            suggestion_data.append({
+                'part_number': part_number,
+                'description': metadata.title if metadata else None,
+                'brand': metadata.part_brand if metadata else None,
+                'keywords': metadata.keywords if metadata else None
+            })
+
+        return suggestion_data
+
+    def cached_dashboard_response():
+        """The cached dashboard, from its pre-compressed bytes when the client takes gzip."""
+        if dashboard_cache['gzip'] is not None and 'gzip' in request.accept_encodings:
+            response = Response(dashboard_cache['gzip'], mimetype='text/html')
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+            return response
+        return dashboard_cache['html']
+
     @app.route('/')
-    def dashboard():
+    async def dashboard():
         """Main dashboard."""
         try:
-            import asyncio
+            # Counts come from the monitor, along with its status version
+            monitor_status = await get_monitor_status()
+
+            # Nothing has been tracked or changed status since the last render
+            status_version = monitor_status.get('status_version')
+            if status_version is not None and status_version == dashboard_cache['version']:
+                return cached_dashboard_response()
 
             # Try to get current status, but handle if services aren't ready yet
             try:
-                # Get status from file monitor
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-                pending_files = loop.run_until_complete(get_files_by_status('awaiting_review'))
-                completed_files = loop.run_until_complete(get_files_by_status('approved'))
-                processing_files = loop.run_until_complete(get_files_by_status('processing'))
-                failed_files = loop.run_until_complete(get_files_by_status('failed'))
-
-                loop.close()
+                # Only the listed statuses are fetched
+                pending_files, completed_files = await asyncio.gather(
+                    get_files_by_status('awaiting_review'),
+                    get_files_by_status('approved')
+                )
 
             except Exception as e:
                 logger.error(f"Error getting file statuses: {e}")
-                # Fallback to empty data
-                pending_files = []
-                completed_files = []
-                processing_files = []
-                failed_files = []
+                pending_files = completed_files = None
+
+            # Don't keep a render built from a failed fetch; retry on the next request
+            cacheable = pending_files is not None and completed_files is not None
+            # Fallback to empty data
+            pending_files = pending_files or []
+            completed_files = completed_files or []
 
             # Add part mapping info to pending files
-            pending_data = []
-            for f in pending_files[:10]:
-                file_data = {
-                    'file_id': f.get('file_id'),
-                    'filename': f.get('filename'),
-                    'size_mb': f.get('size_mb'),
-                    'status': f.get('status'),
-                    'created_at': datetime.now().strftime('%Y-%m-%d %H:%M'),  # TODO: Parse from API
-                    'preview_url': f'/api/preview/{f.get("file_id")}',
-                    'review_url': f'/review/{f.get("file_id")}',
-                    'edit_url': f'/edit/{f.get("file_id")}'
-                }
-
-                # Add part mapping if available and part_mapper is ready
-                if not f.get('part_number') and part_mapper:
-                    try:
-                        mapping_result = part_mapper.map_filename_to_part_number(f.get('filename', ''))
-                        if mapping_result.mapped_part_number:
-                            file_data['suggested_part'] = mapping_result.mapped_part_number
-                            file_data['mapping_confidence'] = mapping_result.confidence_score
-                            file_data['needs_review'] = mapping_result.requires_manual_review
-                    except Exception as e:
-                        logger.warning(f"Part mapping failed for {f.get('filename')}: {e}")
-
-                pending_data.append(file_data)
+            pending_data = await asyncio.to_thread(map_pending_files, pending_files[:10])
 
             # Enhanced stats
-            stats = {
-                'pending': len(pending_files),
-                'completed': len(completed_files),
-                'processing': len(processing_files),
-                'failed': len(failed_files)
-            }
+            stats = status_stats(monitor_status)
 
             completed_data = []
             if completed_files:
+                completed_at = datetime.now().strftime('%Y-%m-%d %H:%M')  # TODO: Parse from API
                 completed_data = [
                     {
                         'file_id': f.get('file_id'),
                         'filename': f.get('filename'),
                         'size_mb': f.get('size_mb'),
-                        'completed_at': datetime.now().strftime('%Y-%m-%d %H:%M')  # TODO: Parse from API
+                        'completed_at': completed_at
                     }
                     for f in completed_files[:10]
                 ]
 
-            return render_template('dashboard.html',
-                                   pending_files=pending_data,
-                                   completed_files=completed_data,
-                                   stats=stats,
-                                   server_url=f"http://{settings.web.host}:{settings.web.port}",
-                                   upload_enabled=True
-                                   )
+            html = await render_template('dashboard.html',
+                                         pending_files=pending_data,
+                                         completed_files=completed_data,
+                                         stats=stats,
+                                         server_url=server_url,
+                                         upload_enabled=True
+                                         )
+            if not cacheable:
+                return html
+
+            # Compress once here rather than in compress_response on every hit
+            dashboard_cache.update(version=status_version, html=html, gzip=gzip_body(html.encode()))
+            return cached_dashboard_response()
         except Exception as e:
             logger.error(f"Dashboard error: {e}")
-            return render_template('error.html', error=str(e)), 500
+            return await render_template('error.html', error=str(e)), 500
+
+    async def trigger_discovery() -> None:
+        """Ask the file monitor to scan for new files now."""
+        try:
+            async with httpx.AsyncClient() as client:
+                await client.get(f"{FILE_MONITOR_URL}/scan")
+        except Exception as e:
+            logger.warning(f"Failed to trigger file discovery: {e}")
+
+    def reserve_upload_path(filename: str) -> Path:
+        """
+        Claim a path in the input directory for an upload, renamed if the name is taken.
+
+        The name is claimed by creating an empty file with O_EXCL, so concurrent
+        uploads of the same filename can't both end up with it.
+        """
+        # Ensure input directory exists
+        input_dir = settings.processing.input_dir
+        input_dir.mkdir(parents=True, exist_ok=True)
+
+        upload_path = input_dir / filename
+
+        # Handle duplicate filenames
+        counter = 1
+        original_path = upload_path
+        while True:
+            try:
+                os.close(os.open(upload_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+                return upload_path
+            except FileExistsError:
+                stem = original_path.stem
+                suffix = original_path.suffix
+                upload_path = original_path.parent / f"{stem}_{counter}{suffix}"
+                counter += 1
+
+    async def stream_body_to(upload_path: Path) -> None:
+        """Write the raw request body to disk as it arrives, off the event loop."""
+        # Written under a temporary name so the file monitor never sees a partial image
+        partial_path = upload_path.with_name(f".{upload_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(partial_path, 'wb') as out:
+                # Collect network chunks and hand the disk writes to a worker thread
+                pending = bytearray()
+                async for chunk in request.body:
+                    pending += chunk
+                    if len(pending) >= FILE_CHUNK_BYTES:
+                        await asyncio.to_thread(out.write, bytes(pending))
+                        pending.clear()
+                if pending:
+                    await asyncio.to_thread(out.write, bytes(pending))
+            os.replace(partial_path, upload_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
 
     @app.route('/upload', methods=['GET', 'POST'])
     async def upload_file():
         """File upload interface."""
         if request.method == 'POST':
-            if 'file' not in request.files:
-                return jsonify({'success': False, 'error': 'No file selected'}), 400
+            # Raw uploads carry the file as the body, named by the X-Filename header;
+            # multipart form uploads are still accepted
+            streamed = request.mimetype == 'application/octet-stream'
+            if streamed:
+                file = None
+                original_name = unquote(request.headers.get('X-Filename', ''))
+            else:
+                files = await request.files
+                if 'file' not in files:
+                    return jsonify({'success': False, 'error': 'No file selected'}), 400
+                file = files['file']
+                original_name = file.filename
 
-            file = request.files['file']
-            if file.filename == '':
+            if not original_name:
                 return jsonify({'success': False, 'error': 'No file selected'}), 400
 
-            if file:
-                filename = secure_filename(file.filename)
+            filename = secure_filename(original_name)
 
-                # Validate file type
-                allowed_extensions = {'.psd', '.png', '.jpg', '.jpeg', '.tiff', '.tif'}
-                file_ext = Path(filename).suffix.lower()
+            # Validate file type
+            file_ext = Path(filename).suffix.lower()
 
-                if file_ext not in allowed_extensions:
-                    return jsonify({
-                        'success': False,
-                        'error': f'Unsupported file type: {file_ext}. Allowed: {", ".join(allowed_extensions)}'
-                    }), 400
+            if file_ext not in ALLOWED_UPLOAD_EXTENSIONS:
+                return jsonify({
+                    'success': False,
+                    'error': f'Unsupported file type: {file_ext}. Allowed: {ALLOWED_UPLOAD_EXTENSIONS_TEXT}'
+                }), 400
 
-                # Ensure input directory exists
-                input_dir = settings.processing.input_dir
-                input_dir.mkdir(parents=True, exist_ok=True)
+            upload_path = await asyncio.to_thread(reserve_upload_path, filename)
 
-                upload_path = input_dir / filename
+            try:
+                if streamed:
+                    await stream_body_to(upload_path)
+                else:
+                    await file.save(upload_path)
+                logger.info(f"File uploaded: {upload_path.name}")
 
-                # Handle duplicate filenames
-                counter = 1
-                original_path = upload_path
-                while upload_path.exists():
-                    stem = original_path.stem
-                    suffix = original_path.suffix
-                    upload_path = original_path.parent / f"{stem}_{counter}{suffix}"
-                    counter += 1
+                # Kick discovery in the background; the upload doesn't wait for the scan
+                scan_task = asyncio.create_task(trigger_discovery())
+                background_tasks.add(scan_task)
+                scan_task.add_done_callback(background_tasks.discard)
 
-                try:
-                    file.save(upload_path)
-                    logger.info(f"File uploaded: {upload_path.name}")
-
-                    # Try to trigger discovery via API
-                    try:
-                        import asyncio
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-
-                        async with httpx.AsyncClient() as client:
-                            await client.get(f"{FILE_MONITOR_URL}/scan")
-
-                        loop.close()
-                    except Exception as e:
-                        logger.warning(f"Failed to trigger file discovery: {e}")
-
-                    return jsonify({
-                        'success': True,
-                        'message': f'File {upload_path.name} uploaded successfully',
-                        'filename': upload_path.name
-                    })
-                except Exception as e:
-                    logger.error(f"Upload failed: {e}")
-                    return jsonify({'success': False, 'error': f'Upload failed: {str(e)}'}), 500
+                return jsonify({
+                    'success': True,
+                    'message': f'File {upload_path.name} uploaded successfully',
+                    'filename': upload_path.name
+                })
+            except Exception as e:
+                logger.error(f"Upload failed: {e}")
+                # Release the claimed name
+                upload_path.unlink(missing_ok=True)
+                return jsonify({'success': False, 'error': f'Upload failed: {str(e)}'}), 500
+            except BaseException:
+                # Client went away mid-upload (CancelledError); don't keep the placeholder
+                upload_path.unlink(missing_ok=True)
+                raise
 
-        return render_template('upload.html')
+        return await render_template('upload.html')
 
     @app.route('/review/<file_id>')
-    def review_file(file_id: str):
+    async def review_file(file_id: str):
         """File review interface."""
-        import asyncio
-
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            file_data = loop.run_until_complete(get_file_by_id(file_id))
-            loop.close()
+            file_data = await get_file_by_id(file_id)
 
             if not file_data:
-                return render_template('error.html', error='File not found'), 404
-
-            # Get part mapping if not already done
-            part_mapping = None
-            if not file_data.get('part_number') and part_mapper:
-                try:
-                    part_mapping = part_mapper.map_filename_to_part_number(file_data['filename'])
-                except Exception as e:
-                    logger.warning(f"Part mapping failed: {e}")
+                return await render_template('error.html', error='File not found'), 404
 
-            # Get part metadata if we have a part number
-            part_metadata = None
-            part_number = file_data.get('part_number') or (part_mapping.mapped_part_number if part_mapping else None)
-            if part_number and filemaker:
-                try:
-                    part_metadata = filemaker.get_part_metadata(part_number)
-                except Exception as e:
-                    logger.warning(f"Failed to get part metadata: {e}")
+            part_mapping, part_number, part_metadata = await asyncio.to_thread(lookup_part, file_data)
 
-            return render_template('review.html',
+            return await render_template('review.html',
                                    file={
                                        'file_id': file_data['file_id'],
                                        'filename': file_data['filename'],
@@ -308,87 +535,62 @@ def create_app() -> Flask:
                                        'size_mb': file_data['size_mb'],
                                        'dimensions': None,  # TODO: Add to API
                                        'part_number': part_number,
-                                       'part_mapping': part_mapping.dict() if part_mapping else None,
-                                       'part_metadata': part_metadata.dict() if part_metadata else None,
+                                       # Models go to the template as-is; Jinja reads their fields
+                                       'part_mapping': part_mapping,
+                                       'part_metadata': part_metadata,
                                        'processing_history': file_data.get('processing_history', [])
                                    },
-                                   server_url=f"http://{settings.web.host}:{settings.web.port}"
+                                   server_url=server_url
                                    )
         except Exception as e:
             logger.error(f"Review error: {e}")
-            return render_template('error.html', error=str(e)), 500
+            return await render_template('error.html', error=str(e)), 500
 
     @app.route('/edit/<file_id>')
-    def edit_metadata(file_id: str):
+    async def edit_metadata(file_id: str):
         """Metadata editing interface."""
-        import asyncio
-
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            file_data = loop.run_until_complete(get_file_by_id(file_id))
-            loop.close()
+            file_data = await get_file_by_id(file_id)
 
             if not file_data:
-                return render_template('error.html', error='File not found'), 404
-
-            # Get part mapping if not already done
-            part_mapping = None
-            if not file_data.get('part_number') and part_mapper:
-                try:
-                    part_mapping = part_mapper.map_filename_to_part_number(file_data['filename'])
-                except Exception as e:
-                    logger.warning(f"Part mapping failed: {e}")
+                return await render_template('error.html', error='File not found'), 404
 
             # Get current metadata
-            part_number = file_data.get('part_number') or (part_mapping.mapped_part_number if part_mapping else None)
-            part_metadata = None
-            if part_number and filemaker:
-                try:
-                    part_metadata = filemaker.get_part_metadata(part_number)
-                except Exception as e:
-                    logger.warning(f"Failed to get part metadata: {e}")
+            part_mapping, part_number, part_metadata = await asyncio.to_thread(lookup_part, file_data)
 
-            return render_template('edit_metadata.html',
+            return await render_template('edit_metadata.html',
                                    file={
                                        'file_id': file_data['file_id'],
                                        'filename': file_data['filename'],
                                        'status': file_data['status'],
                                        'size_mb': file_data['size_mb'],
                                        'part_number': part_number,
-                                       'part_mapping': part_mapping.dict() if part_mapping else None,
-                                       'metadata_info': part_metadata.dict() if part_metadata else None,
+                                       'part_mapping': part_mapping,
+                                       'metadata_info': part_metadata,
                                        'processing_history': file_data.get('processing_history', [])
                                    },
-                                   server_url=f"http://{settings.web.host}:{settings.web.port}"
+                                   server_url=server_url
                                    )
         except Exception as e:
             logger.error(f"Edit metadata error: {e}")
-            return render_template('error.html', error=str(e)), 500
+            return await render_template('error.html', error=str(e)), 500
 
     @app.route('/test')
     async def test_route():
-        """Simple test route to verify Flask is working."""
+        """Simple test route to verify the web app is working."""
         # Test file monitor connection
         file_monitor_status = False
         try:
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             async with httpx.AsyncClient() as client:
                 response = await client.get(f"{FILE_MONITOR_URL}/health", timeout=5.0)
                 file_monitor_status = response.status_code == 200
-
-            loop.close()
         except:
             pass
 
         return jsonify({
             'status': 'ok',
-            'message': 'Flask app is running',
-            'timestamp': datetime.now().isoformat(),
+            'message': 'Web app is running',
+            'timestamp': coarse_now_iso(),
             'services': {
                 'file_monitor_api': file_monitor_status,
                 'part_mapper': part_mapper is not None,
@@ -401,65 +603,100 @@ def create_app() -> Flask:
     async def api_status():
         """API endpoint for system status."""
         try:
-            import asyncio
-
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            # Get stats from file monitor service
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(f"{FILE_MONITOR_URL}/status")
-
-                    if response.status_code == 200:
-                        monitor_data = response.json()
-                        total_tracked = monitor_data.get('total_tracked_files', 0)
-                    else:
-                        total_tracked = 0
-            except:
-                total_tracked = 0
-
-            # Get file counts by status
-            pending_files = loop.run_until_complete(get_files_by_status('awaiting_review'))
-            processing_files = loop.run_until_complete(get_files_by_status('processing'))
-            completed_files = loop.run_until_complete(get_files_by_status('approved'))
-            failed_files = loop.run_until_complete(get_files_by_status('failed'))
-
-            loop.close()
-
-            stats = {
-                'pending': len(pending_files),
-                'processing': len(processing_files),
-                'completed': len(completed_files),
-                'failed': len(failed_files),
-                'total_tracked': total_tracked,
-                'database_connected': filemaker.test_connection() if filemaker else False,
-                'part_mapper_ready': len(part_mapper.interchange_cache) > 0 if part_mapper else False,
-                'timestamp': datetime.now().isoformat()
-            }
+            # Get stats from file monitor service; one request covers every count
+            monitor_status = await get_monitor_status()
+            database_connected = await asyncio.to_thread(cached_db_connected)
+            part_mapper_ready = len(part_mapper.interchange_cache) > 0 if part_mapper else False
+
+            # Unchanged while no file is tracked or changes status, so pollers
+            # revalidating with If-None-Match get an empty 304
+            etag = None
+            status_version = monitor_status.get('status_version')
+            if status_version is not None:
+                etag = f"{status_version}-{int(database_connected)}{int(part_mapper_ready)}"
+
+            # compress_response suffixes the ETag of gzipped bodies, so accept either variant
+            held_etag = None
+            if etag:
+                held_etag = next(
+                    (tag for tag in (etag, etag + GZIP_ETAG_SUFFIX) if request.if_none_match.contains(tag)),
+                    None
+                )
+
+            if held_etag:
+                response = Response('', status=304)
+                etag = held_etag
+            else:
+                response = jsonify({
+                    **status_stats(monitor_status),
+                    'total_tracked': monitor_status.get('total_tracked_files', 0),
+                    'database_connected': database_connected,
+                    'part_mapper_ready': part_mapper_ready,
+                    'timestamp': coarse_now_iso()
+                })
 
-            return jsonify(stats)
+            if etag:
+                response.set_etag(etag)
+            response.cache_control.no_cache = True
+            response.cache_control.must_revalidate = True
+            return response
 
         except Exception as e:
             logger.error(f"Status API error: {e}")
             return jsonify({'error': str(e)}), 500
 
-    @app.route('/api/approve/<file_id>', methods=['POST'])
-    def api_approve_file(file_id: str):
-        """API endpoint to approve a file for production."""
+    @app.route('/api/decisions/pending')
+    async def api_pending_decisions():
+        """API endpoint for review decisions not yet picked up by the workflow."""
+        # Long-poll: the monitor holds the request up to `wait` seconds for a decision
+        wait = request.args.get('wait', 0.0, type=float)
         try:
-            import asyncio
+            async with httpx.AsyncClient(timeout=wait + 10.0) as client:
+                response = await client.get(
+                    f"{FILE_MONITOR_URL}/decisions/pending", params={'wait': wait}
+                )
+
+            if response.status_code != 200:
+                logger.error(f"File monitor API error: {response.status_code}")
+                return jsonify({'decisions': [], 'error': 'File monitor unavailable'}), 502
+
+            return jsonify({'decisions': response.json().get('decisions', [])})
+
+        except Exception as e:
+            logger.error(f"Pending decisions API error: {e}")
+            return jsonify({'decisions': [], 'error': str(e)}), 500
+
+    @app.route('/api/decisions/ack', methods=['POST'])
+    async def api_acknowledge_decisions():
+        """API endpoint for the workflow to confirm it received review decisions."""
+        try:
+            data = await request.get_json() or {}
+            decision_ids = data.get('decision_ids', [])
+
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    f"{FILE_MONITOR_URL}/decisions/ack", json={'decision_ids': decision_ids}
+                )
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            if response.status_code != 200:
+                logger.error(f"File monitor API error: {response.status_code}")
+                return jsonify({'success': False, 'error': 'File monitor unavailable'}), 502
 
-            success = loop.run_until_complete(update_file_status_api(
+            return jsonify({'success': True, 'acknowledged': response.json().get('acknowledged', 0)})
+
+        except Exception as e:
+            logger.error(f"Decision acknowledgement API error: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/approve/<file_id>', methods=['POST'])
+    async def api_approve_file(file_id: str):
+        """API endpoint to approve a file for production."""
+        try:
+            success = await update_file_status_api(
                 file_id,
                 "approved",
                 "Approved for production processing"
-            ))
-
-            loop.close()
+            )
 
             if success:
                 return jsonify({
@@ -474,24 +711,17 @@ def create_app() -> Flask:
             return jsonify({'error': str(e)}), 500
 
     @app.route('/api/reject/<file_id>', methods=['POST'])
-    def api_reject_file(file_id: str):
+    async def api_reject_file(file_id: str):
         """API endpoint to reject a file."""
         try:
-            import asyncio
-
-            data = request.get_json() or {}
+            data = await request.get_json() or {}
             reason = data.get('reason', 'Quality insufficient')
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            success = loop.run_until_complete(update_file_status_api(
+            success = await update_file_status_api(
                 file_id,
                 "rejected",
                 reason
-            ))
-
-            loop.close()
+            )
 
             if success:
                 return jsonify({
@@ -506,16 +736,10 @@ def create_app() -> Flask:
             return jsonify({'error': str(e)}), 500
 
     @app.route('/api/preview/<file_id>')
-    def api_preview_image(file_id: str):
-        """Serve preview image for a file."""
+    async def api_preview_image(file_id: str):
+        """Serve a preview thumbnail for a file, or the original with ?full=1."""
         try:
-            import asyncio
-
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            file_data = loop.run_until_complete(get_file_by_id(file_id))
-            loop.close()
+            file_data = await get_file_by_id(file_id)
 
             if not file_data:
                 return "Image not found", 404
@@ -524,14 +748,24 @@ def create_app() -> Flask:
             if not file_path.exists():
                 return "Image file not found on disk", 404
 
-            return send_file(file_path)
+            if not request.args.get('full'):
+                thumbnail_path = await asyncio.to_thread(
+                    get_thumbnail, file_path, thumbnail_dir, file_id
+                )
+                if thumbnail_path:
+                    response = await send_file(thumbnail_path, mimetype='image/webp', conditional=True)
+                    response.cache_control.public = True
+                    response.cache_control.max_age = THUMBNAIL_MAX_AGE_SECONDS
+                    return response
+
+            return await send_file(file_path, conditional=True)
 
         except Exception as e:
             logger.error(f"Preview API error: {e}")
             return "Error serving image", 500
 
     @app.route('/api/part-suggestions')
-    def api_part_suggestions():
+    async def api_part_suggestions():
         """API endpoint for part number suggestions."""
         try:
             query = request.args.get('q', '').strip()
@@ -543,24 +777,7 @@ def create_app() -> Flask:
             if not part_mapper:
                 return jsonify({'suggestions': [], 'error': 'Part mapper not available'})
 
-            suggestions = part_mapper.get_manual_override_suggestions(filename, query)
-
-            # Get additional metadata for suggestions
-            suggestion_data = []
-            for part_number in suggestions[:10]:  # Limit to 10
-                metadata = None
-                if filemaker:
-                    try:
-                        metadata = filemaker.get_part_metadata(part_number)
-                    except Exception as e:
-                        logger.warning(f"Failed to get metadata for {part_number}: {e}")
-
-                suggestion_data.append({
-                    'part_number': part_number,
-                    'description': metadata.title if metadata else None,
-                    'brand': metadata.part_brand if metadata else None,
-                    'keywords': metadata.keywords if metadata else None
-                })
+            suggestion_data = await asyncio.to_thread(suggest_parts, filename, query)
 
             return jsonify({'suggestions': suggestion_data})
 
@@ -568,25 +785,48 @@ def create_app() -> Flask:
             logger.error(f"Part suggestions API error: {e}")
             return jsonify({'suggestions': [], 'error': str(e)})
 
+    @app.after_request
+    async def compress_response(response):
+        """Gzip HTML and JSON bodies held in memory; files stream as they are."""
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or not isinstance(response.response, DataBody)
+                or 'Content-Encoding' in response.headers
+                or 'gzip' not in request.accept_encodings):
+            return response
+
+        compressed = gzip_body(await response.get_data())
+        if compressed is None:
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+
+        # The gzipped body is a different representation, so it needs its own validator
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+        return response
+
     @app.errorhandler(404)
-    def not_found(error):
-        return render_template('error.html', error='Page not found'), 404
+    async def not_found(error):
+        return await render_template('error.html', error='Page not found'), 404
 
     @app.errorhandler(500)
-    def internal_error(error):
+    async def internal_error(error):
         logger.error(f"Internal server error: {error}")
-        return render_template('error.html', error='Internal server error'), 500
+        return await render_template('error.html', error='Internal server error'), 500
 
     @app.errorhandler(Exception)
-    def handle_exception(e):
+    async def handle_exception(e):
         logger.error(f"Unhandled exception: {e}")
-        return render_template('error.html', error=f'Application error: {str(e)}'), 500
+        return await render_template('error.html', error=f'Application error: {str(e)}'), 500
 
     return app
 
 
 def main():
-    """Main entry point for web server."""
+    """Main entry point for the development web server (containers run uvicorn)."""
     app = create_app()
     app.run(
         host=settings.web.host,
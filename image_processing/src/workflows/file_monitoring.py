@@ -39,6 +39,11 @@ class FileMonitoringWorkflow:
             # Discover new files
             new_files = self.file_monitor.discover_new_files()
 
+            # Check every file's part number candidates in one database round-trip
+            self.part_mapper.prefetch_current_parts(
+                f.metadata.filename for f in new_files if not f.part_number
+            )
+
             # Process each new file for part mapping
             processed_files = []
             for file_obj in new_files:
@@ -79,6 +84,10 @@ class FileMonitoringWorkflow:
             # Get all files needing processing
             processable_files = self.file_monitor.get_files_needing_processing()
 
+            self.part_mapper.prefetch_current_parts(
+                f.metadata.filename for f in processable_files if not f.part_number
+            )
+
             # Process file data for workflow
             processed_data = []
             for file_obj in processable_files:
@@ -105,4 +105,26 @@ class TestProcessedFile:
 
         assert file_obj.metadata.status == FileStatus.PROCESSING
         assert len(file_obj.processing_history) == 1
-        assert file_obj.processing_history[0]["details"]["reason"] == "Started processing"
\ No newline at end of file
+        assert file_obj.processing_history[0]["details"]["reason"] == "Started processing"
+
+    def test_current_location_str(self):
+        """Test cached string form of current_location follows location changes."""
+        metadata = FileMetadata(
+            file_id="test123_abcd5678",
+            original_path=Path("/test/image.jpg"),
+            filename="image.jpg",
+            file_type=FileType.JPEG,
+            size_bytes=1024,
+            checksum_md5="test",
+            checksum_sha256="test",
+            modified_at=datetime.now()
+        )
+
+        file_obj = ProcessedFile(metadata=metadata)
+        assert file_obj.current_location_str == ""
+
+        file_obj.current_location = Path("/test/input/image.jpg")
+        assert file_obj.current_location_str == "/test/input/image.jpg"
+
+        file_obj.current_location = Path("/test/processing/image.jpg")
+        assert file_obj.current_location_str == "/test/processing/image.jpg"
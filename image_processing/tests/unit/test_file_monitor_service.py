@@ -1,9 +1,12 @@
 # ===== tests/unit/test_file_monitor_service.py =====
+import stat
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 from datetime import datetime
 
+from ...src.services import file_monitor_service
 from ...src.services.file_monitor_service import FileMonitorService
 from ...src.models.file_models import FileStatus, FileType
 
@@ -33,12 +36,12 @@ class TestFileMonitorService:
         # Mock file system
         mock_file = Mock()
         mock_file.name = "test.jpg"
-        mock_file.is_file.return_value = True
-        mock_file.stat.return_value = Mock(st_size=2048, st_mtime=datetime.now().timestamp())
         mock_file.suffix = ".jpg"
+        mock_stat = Mock(st_ino=1, st_size=2048, st_mtime_ns=1, st_mtime=datetime.now().timestamp())
 
         with patch.object(file_monitor.input_dir, 'exists', return_value=True), \
-                patch.object(file_monitor.input_dir, 'iterdir', return_value=[mock_file]), \
+                patch.object(file_monitor, '_scan_input_dir', return_value=[(mock_file, mock_stat)]), \
+                patch.object(file_monitor, '_input_dir_mtime_ns', return_value=1), \
                 patch('src.services.file_monitor_service.is_valid_image_file', return_value=True), \
                 patch.object(file_monitor, '_create_file_metadata') as mock_create, \
                 patch.object(file_monitor, '_save_state'):
@@ -54,6 +57,44 @@ class TestFileMonitorService:
             assert new_files[0] == mock_processed_file
             assert mock_processed_file.metadata.file_id in file_monitor._tracked_files
 
+            # Unchanged directory is not re-walked or re-hashed on the next scan
+            mock_create.reset_mock()
+            assert file_monitor.discover_new_files() == []
+            mock_create.assert_not_called()
+
+    def test_discover_new_files_from_watcher(self, file_monitor, tmp_path):
+        """Test that a watcher-fed scan only examines reported paths."""
+        file_monitor.input_dir = tmp_path
+        mock_file = Mock()
+        mock_file.name = "new.jpg"
+        mock_file.suffix = ".jpg"
+        mtime = datetime.now().timestamp() - 3600
+        mock_file.stat.return_value = Mock(
+            st_mode=stat.S_IFREG | 0o644, st_ino=2, st_size=2048,
+            st_mtime=mtime, st_mtime_ns=int(mtime * 1e9)
+        )
+
+        file_monitor.start_watching()
+
+        with patch.object(file_monitor, '_scan_input_dir', return_value=[]) as mock_walk, \
+                patch.object(file_monitor, '_input_dir_mtime_ns', return_value=1), \
+                patch.object(file_monitor_service, 'is_valid_image_file', return_value=True), \
+                patch.object(file_monitor, '_create_file_metadata') as mock_create, \
+                patch.object(file_monitor, '_save_state'):
+            mock_processed_file = Mock()
+            mock_processed_file.metadata.file_id = "new_123"
+            mock_create.return_value = mock_processed_file
+
+            # First scan after starting the watcher walks the directory
+            assert file_monitor.discover_new_files() == []
+            assert mock_walk.call_count == 1
+
+            file_monitor.notify_changes([mock_file])
+            new_files = file_monitor.discover_new_files()
+
+            assert new_files == [mock_processed_file]
+            assert mock_walk.call_count == 1
+
     def test_get_files_needing_processing(self, file_monitor):
         """Test getting files that need processing."""
         # Setup mock files
@@ -93,4 +134,90 @@ class TestFileMonitorService:
         mock_file.update_status.assert_called_once_with(
             FileStatus.PROCESSING,
             "Starting processing"
-        )
\ No newline at end of file
+        )
+
+    def test_get_file_by_checksum(self, file_monitor):
+        """Test duplicate lookup through the checksum index."""
+        mock_file = Mock()
+        mock_file.metadata.file_id = "test_id"
+        mock_file.metadata.checksum_sha256 = "abc123"
+
+        file_monitor._track_file(mock_file)
+
+        assert file_monitor.get_file_by_checksum("abc123") is mock_file
+        assert file_monitor.get_file_by_checksum("unknown") is None
+
+    def test_seen_entries_survive_restart(self, file_monitor, tmp_path):
+        """Test examined files are remembered in the state file."""
+        file_monitor.state_file = tmp_path / "file_monitor_state.json"
+        file_monitor._seen_entries[Path("/test/input/a.jpg")] = (1, 2048, 10)
+
+        file_monitor._save_state()
+        file_monitor._seen_entries.clear()
+        file_monitor._load_state()
+
+        assert file_monitor._seen_entries == {Path("/test/input/a.jpg"): (1, 2048, 10)}
+
+    def test_status_counts_follow_updates(self, file_monitor):
+        """Test status counts and buckets stay in step with status changes."""
+        mock_file = Mock()
+        mock_file.metadata.file_id = "test_id"
+        mock_file.metadata.checksum_sha256 = "abc123"
+        mock_file.metadata.status = FileStatus.DISCOVERED
+        mock_file.update_status.side_effect = lambda status, reason=None: setattr(
+            mock_file.metadata, 'status', status
+        )
+        file_monitor._track_file(mock_file)
+
+        with patch.object(file_monitor, '_save_state'):
+            file_monitor.update_file_status("test_id", FileStatus.PROCESSING)
+
+        counts = file_monitor.status_counts()
+        assert counts[FileStatus.DISCOVERED] == 0
+        assert counts[FileStatus.PROCESSING] == 1
+        assert file_monitor.get_statistics()['processing'] == 1
+        assert file_monitor.get_files_by_status(FileStatus.DISCOVERED) == []
+        assert file_monitor.get_files_by_status(FileStatus.PROCESSING) == [mock_file]
+        assert file_monitor.get_files_by_status(FileStatus.PROCESSING, limit=0) == []
+
+    def test_pending_decisions_queue(self, file_monitor):
+        """Test approvals are queued once and kept until acknowledged."""
+        mock_file = Mock()
+        mock_file.metadata.file_id = "test_id"
+        mock_file.metadata.checksum_sha256 = "abc123"
+        mock_file.metadata.status = FileStatus.AWAITING_REVIEW
+        mock_file.update_status.side_effect = lambda status, reason=None: setattr(
+            mock_file.metadata, 'status', status
+        )
+        file_monitor._track_file(mock_file)
+
+        with patch.object(file_monitor, '_save_state'):
+            file_monitor.update_file_status("test_id", FileStatus.APPROVED, "Looks good")
+            file_monitor.update_file_status("test_id", FileStatus.APPROVED)
+
+        assert file_monitor.has_pending_decisions()
+        decisions = file_monitor.get_pending_decisions()
+        assert len(decisions) == 1
+        assert decisions[0]["file_id"] == "test_id"
+        assert decisions[0]["action"] == "approve"
+
+        # Reading doesn't consume; only an acknowledgement does
+        assert file_monitor.get_pending_decisions() == decisions
+        with patch.object(file_monitor, '_save_state'):
+            assert file_monitor.acknowledge_decisions(["unknown"]) == 0
+            assert file_monitor.acknowledge_decisions([decisions[0]["decision_id"]]) == 1
+        assert not file_monitor.has_pending_decisions()
+        assert file_monitor.get_pending_decisions() == []
+
+    def test_pending_decisions_survive_restart(self, file_monitor, tmp_path):
+        """Test unacknowledged decisions are kept in the state file."""
+        file_monitor.state_file = tmp_path / "file_monitor_state.json"
+        decision = {"decision_id": "d1", "file_id": "test_id", "action": "reject",
+                    "reason": None, "timestamp": "2024-01-01T00:00:00"}
+        file_monitor._pending_decisions.append(decision)
+
+        file_monitor._save_state()
+        file_monitor._pending_decisions.clear()
+        file_monitor._load_state()
+
+        assert file_monitor.get_pending_decisions() == [decision]
@@ -1,7 +1,10 @@
 # ===== tests/unit/test_part_mapping_service.py =====
+from contextlib import nullcontext
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
+from ...src.services import part_mapping_service
 from ...src.services.part_mapping_service import PartMappingService
 from ...src.models.part_mapping_models import InterchangeMapping, PartMappingResult
 
@@ -16,13 +19,15 @@ class TestPartMappingService:
             mock_instance = Mock()
             mock_instance.test_connection.return_value = True
             mock_instance.connection = Mock()
+            mock_instance._pooled_connection.side_effect = lambda: nullcontext(mock_instance.connection)
             mock_fm.return_value = mock_instance
             yield mock_instance
 
     @pytest.fixture
     def part_mapper(self, mock_filemaker):
         """Create PartMappingService with mocked dependencies."""
-        with patch.object(PartMappingService, '_load_interchange_mappings'):
+        with patch.object(PartMappingService, '_load_interchange_mappings'), \
+                patch.object(PartMappingService, '_load_active_parts'):
             service = PartMappingService()
             service.filemaker = mock_filemaker
             return service
@@ -63,12 +68,12 @@ class TestPartMappingService:
         filename = "OLD12345_1.jpg"
 
         # Setup interchange mapping
+        part_mapper.interchange_cache["OLD12345"] = ("NEW12345", "IC")
         interchange = InterchangeMapping(
             old_part_number="OLD12345",
             new_part_number="NEW12345",
             interchange_code="IC"
         )
-        part_mapper.interchange_cache["OLD12345"] = interchange
         part_mapper._is_current_part_number = Mock(return_value=False)
 
         result = part_mapper.map_filename_to_part_number(filename)
@@ -96,10 +101,13 @@ class TestPartMappingService:
         """Test loading interchange mappings from database."""
         # Mock database response
         cursor_mock = Mock()
-        cursor_mock.fetchall.return_value = [
-            ("IC1", "OLD123", "NEW123"),
-            ("IC2", "OLD456", "NEW456"),
-            (None, "OLD789", "NEW789"),  # Test null code handling
+        cursor_mock.fetchmany.side_effect = [
+            [
+                ("IC1", "OLD123", "NEW123"),
+                ("IC2", "OLD456", "NEW456"),
+            ],
+            [(None, "OLD789", "NEW789")],  # Test null code handling
+            [],
         ]
         cursor_mock.close = Mock()
 
@@ -110,8 +118,13 @@ class TestPartMappingService:
         # Verify mappings were loaded
         assert len(service.interchange_cache) == 3
         assert "OLD123" in service.interchange_cache
-        assert service.interchange_cache["OLD123"].new_part_number == "NEW123"
-        assert service.interchange_cache["OLD123"].interchange_code == "IC1"
+        assert service.interchange_cache["OLD123"] == ("NEW123", "IC1")
+        assert service.interchange_cache["OLD789"] == ("NEW789", "")
+
+        mapping = service.get_interchange_mapping("OLD123")
+        assert mapping.new_part_number == "NEW123"
+        assert mapping.interchange_code == "IC1"
+        assert service.get_interchange_mapping("MISSING") is None
 
     def test_validate_part_number(self, part_mapper):
         """Test part number validation."""
@@ -159,6 +172,15 @@ class TestPartMappingService:
         assert "J1234567" in suggestions
         cursor_mock.execute.assert_called_once()
 
+    def test_manual_override_suggestions_from_loaded_parts(self, part_mapper):
+        """Test suggestions come from the loaded part numbers without a query."""
+        part_mapper._sorted_parts = ("A12345", "J1234567", "J1234568", "J2000000")
+
+        suggestions = part_mapper.get_manual_override_suggestions("test.jpg", "j123")
+
+        assert suggestions == ["J1234567", "J1234568"]
+        part_mapper.filemaker.connection.cursor.assert_not_called()
+
     def test_fuzzy_matching(self, part_mapper):
         """Test fuzzy matching functionality."""
         # Mock database response for fuzzy match
@@ -215,11 +237,7 @@ class TestPartMappingService:
     def test_cache_performance(self, part_mapper):
         """Test that caching improves performance."""
         # Setup cache
-        part_mapper.interchange_cache["TEST123"] = InterchangeMapping(
-            old_part_number="TEST123",
-            new_part_number="NEW123",
-            interchange_code="IC"
-        )
+        part_mapper.interchange_cache["TEST123"] = ("NEW123", "IC")
 
         # First call should use cache
         result1 = part_mapper.map_filename_to_part_number("TEST123_1.jpg")
@@ -228,4 +246,113 @@ class TestPartMappingService:
         result2 = part_mapper.map_filename_to_part_number("TEST123_2.jpg")
 
         assert result1.mapped_part_number == result2.mapped_part_number
-        assert result1.mapping_method == "interchange_mapping"
\ No newline at end of file
+        assert result1.mapping_method == "interchange_mapping"
+
+    def test_mapping_results_are_memoized(self, part_mapper):
+        """Test repeated filenames and part numbers skip the database."""
+        cursor_mock = Mock()
+        cursor_mock.fetchone.return_value = (1,)
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+
+        result1 = part_mapper.map_filename_to_part_number("J1234567_2.jpg")
+        result2 = part_mapper.map_filename_to_part_number("J1234567_2.png")
+        assert part_mapper.validate_part_number("J1234567") is True
+
+        assert result1.mapped_part_number == result2.mapped_part_number == "J1234567"
+        assert result2.original_filename == "J1234567_2.png"
+        cursor_mock.execute.assert_called_once()
+
+        # Refreshing from the database drops memoized lookups
+        with patch.object(part_mapper, '_load_interchange_mappings'):
+            part_mapper.refresh_interchange_cache()
+        part_mapper.map_filename_to_part_number("J1234567_2.jpg")
+        assert cursor_mock.execute.call_count == 2
+
+    def test_bulk_check_current(self, part_mapper):
+        """Test many part numbers are checked with one query per batch."""
+        cursor_mock = Mock()
+        cursor_mock.fetchall.return_value = [("J1234567",)]
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+
+        current = part_mapper.bulk_check_current(["J1234567", "A12345", "J1234567"])
+
+        assert current == {"J1234567"}
+        cursor_mock.execute.assert_called_once()
+        assert cursor_mock.execute.call_args[0][1] == ["J1234567", "A12345"]
+
+        # Answers are reused by single lookups
+        assert part_mapper.validate_part_number("A12345") is False
+        cursor_mock.execute.assert_called_once()
+
+    def test_active_parts_answer_without_queries(self, part_mapper):
+        """Test preloaded active parts replace per-part database queries."""
+        cursor_mock = Mock()
+        cursor_mock.fetchall.return_value = [(" j1234567 ",), ("A12345",), (None,)]
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+
+        part_mapper._load_active_parts()
+        cursor_mock.execute.reset_mock()
+
+        assert part_mapper.validate_part_number("J1234567") is True
+        assert part_mapper.validate_part_number("B99999") is False
+        assert part_mapper.bulk_check_current(["A12345", "B99999"]) == {"A12345"}
+        cursor_mock.execute.assert_not_called()
+
+    def test_fuzzy_matching_uses_trigram_index(self, part_mapper):
+        """Test fuzzy matching against preloaded parts skips LIKE queries."""
+        cursor_mock = Mock()
+        cursor_mock.fetchall.return_value = [("J01234567",), ("X1234567Z",), ("J7654321",)]
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+
+        part_mapper._load_active_parts()
+        cursor_mock.execute.reset_mock()
+
+        result = part_mapper._find_fuzzy_match("01234567")
+
+        assert result["part_number"] == "J01234567"
+        assert result["method"] == "fuzzy_match"
+        assert part_mapper._find_fuzzy_match("99999") is None
+        cursor_mock.execute.assert_not_called()
+
+    def test_similarity_match_for_typos(self, part_mapper):
+        """Test edit-distance ranking when no variation is a substring."""
+        pytest.importorskip("rapidfuzz")
+        cursor_mock = Mock()
+        cursor_mock.fetchall.return_value = [("J1234567",), ("J7654321",)]
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+        part_mapper._load_active_parts()
+
+        result = part_mapper._find_fuzzy_match("J1234576")
+
+        assert result["part_number"] == "J1234567"
+        assert result["method"] == "similarity_match"
+        assert result["confidence"] < 0.6
+
+    def test_similarity_match_without_rapidfuzz(self, part_mapper):
+        """Test Sift3 ranking is used when rapidfuzz is not installed."""
+        cursor_mock = Mock()
+        cursor_mock.fetchall.return_value = [("J1234567",), ("J7654321",)]
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+        part_mapper._load_active_parts()
+
+        with patch.object(part_mapping_service, 'fuzz_process', None), \
+                patch.object(part_mapping_service, '_sift3', wraps=part_mapping_service._sift3) as mock_sift3:
+            result = part_mapper._find_fuzzy_match("J1234576")
+
+        assert result["part_number"] == "J1234567"
+        assert result["method"] == "similarity_match"
+        assert mock_sift3.called
+
+    def test_lookup_cursor_is_reused(self, part_mapper):
+        """Test lookups borrow pooled connections and reuse one cursor per thread."""
+        cursor_mock = Mock()
+        cursor_mock.fetchone.return_value = (1,)
+        part_mapper.filemaker.connection.cursor.return_value = cursor_mock
+
+        part_mapper.validate_part_number("J1234567")
+        part_mapper.validate_part_number("A12345")
+
+        assert cursor_mock.execute.call_count == 2
+        assert part_mapper.filemaker._pooled_connection.call_count == 2
+        part_mapper.filemaker.connection.cursor.assert_called_once()
+        cursor_mock.close.assert_not_called()